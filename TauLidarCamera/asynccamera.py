@@ -0,0 +1,462 @@
+import asyncio
+
+from TauLidarCommon.frame import FrameType
+
+from .constants import *
+from .communication import Communication
+from .camera import Camera, _FRAME_COMMANDS
+from .config import CameraConfig, ConfigurationError
+from .info import CameraInfo
+
+POLL_INTERVAL = 0.002  ## seconds between polls of the serial port where the event loop can not watch it
+
+class AsyncCamera :
+    '''
+    asyncio version of Camera, all serial I/O is non-blocking so one event loop can drive many cameras
+    without a thread per camera.
+
+    To initiate an instance of AsyncCamera object, await the static method AsyncCamera.open(port=None):
+
+        camera = await AsyncCamera.open('/dev/ttyACM0')
+
+        async with camera.stream(FrameType.DISTANCE) as frames:
+            async for frame in frames:
+                ...
+
+        camera.close()
+
+    The protocol is the same as Camera, the packets, the parameter shadowing and the reply handling of
+    Communication are reused. Frames are LazyFrame objects, their attributes are computed when first
+    accessed which is CPU bound, applications serving raw data should prefer readFrameRawData(frameType)
+    and stream(frameType, raw=True).
+    '''
+
+    def __init__(self) :
+        self._comm = Communication()
+        self._comm._ser.timeout = 0 ## non-blocking reads
+
+        ## a Camera sharing the communication, its setters queue packets in batch mode
+        self._camera = Camera()
+        self._camera._comm = self._comm
+
+        self._lock = asyncio.Lock()
+        self._streaming = False
+        self._streamSize = 0
+        self._info = None
+
+    @staticmethod
+    async def open(port=None) :
+        '''
+        open communication to the camera via serial port, see Camera.open(port).
+
+        Returns
+        ----------
+        AsyncCamera
+            An instance of AsyncCamera object which connected to the ToF camera.
+        '''
+        if port is None :
+            ## probing the ports is a one-off blocking scan, keep it off the event loop
+            loop = asyncio.get_event_loop()
+            ports = await loop.run_in_executor(None, Camera.scan)
+            if len(ports) == 0 :
+                raise Exception("No Tau Camera found, please check: \n1. If Tau Camera is connected; \n2. If current user has permission to access all serial ports.")
+            port = ports[0]
+
+        camera = AsyncCamera()
+        camera._comm.open(port)
+
+        try:
+            await camera._apply(camera._camera.setDefaultParameters)
+            camera._info = await camera._readInfo()
+        except:
+            camera.close()
+            raise
+
+        return camera
+
+    def close(self) :
+        '''
+        Close communication to the camera, a stream not stopped with stopStream() is stopped.
+        '''
+        comm = self._comm
+
+        if self._streaming and comm._ser.is_open :
+            ## the port is closed right after, the frames still in flight need no wait
+            comm._sendStopStream()
+            comm._flushStream()
+
+        self._streaming = False
+        comm.close()
+
+    def info(self) :
+        '''
+        get camera information read when the camera was opened, see Camera.info().
+        '''
+        info = self._info
+        return CameraInfo(info.model, info.firmware, info.uid, Camera._roiResolution(self._comm), info.port)
+
+    def roi(self) :
+        '''
+        get the ROI acknowledged by the camera, see Camera.roi().
+        '''
+        return self._camera.roi()
+
+    def hdr(self) :
+        '''
+        get the HDR mode acknowledged by the camera, see Camera.hdr().
+        '''
+        return self._camera.hdr()
+
+    async def _waitReadable(self) :
+        loop = asyncio.get_event_loop()
+
+        try:
+            fd = self._comm._ser.fileno()
+            future = loop.create_future()
+
+            def ready() :
+                if not future.done() :
+                    future.set_result(None)
+
+            loop.add_reader(fd, ready)
+        except (AttributeError, NotImplementedError) :
+            await asyncio.sleep(POLL_INTERVAL)
+            return
+
+        try:
+            await future
+        finally:
+            loop.remove_reader(fd)
+
+    async def _readInto(self, view) :
+
+        received = 0
+        while received < len(view) :
+            received += self._comm._ser.readinto(view[received:])
+
+            if received < len(view) :
+                await self._waitReadable()
+
+        return received
+
+    async def _readReply(self, size) :
+
+        reply = self._comm._receive(size)
+
+        try:
+            view = next(reply)
+            while True :
+                view = reply.send(await self._readInto(view))
+        except StopIteration as result :
+            return result.value
+
+    async def _read(self, size) :
+
+        try:
+            return await asyncio.wait_for(self._readReply(size), self._comm._readTimeout)
+        except asyncio.TimeoutError :
+            self._comm._ser.reset_input_buffer()
+            return (-1, bytearray(0))
+
+    def _checkIdle(self) :
+
+        if not self._comm._ser.is_open :
+            raise Exception("Camera is not opened!")
+
+        if self._streaming :
+            raise Exception("Camera is streaming, stop the stream first!")
+
+    async def _query(self, packet, size) :
+
+        self._checkIdle()
+
+        async with self._lock :
+            self._comm._ser.write(packet)
+            return await self._read(size)
+
+    async def _apply(self, function) :
+        '''
+        run setters of the shared Camera in batch mode, then send the queued packets and collect the replies.
+        '''
+        self._checkIdle()
+
+        comm = self._comm
+        async with self._lock :
+            comm.beginBatch()
+            try:
+                function()
+            except:
+                comm.cancelBatch()
+                raise
+
+            batch = comm._takeBatch()
+            if not batch :
+                return []
+
+            comm._ser.write(b''.join(packet for key, value, packet in batch))
+
+            results = []
+            for key, value, packet in batch :
+                type, data = await self._read(0)
+
+                comm._updateParameter(key, value, type)
+                results.append((key, type))
+
+            return results
+
+    async def _readInfo(self) :
+
+        comm = self._comm
+
+        type, identification = await self._query(comm._getPacket(comm._commandWithoutData(COMMAND_GET_IDENTIFICATION)), IDENTIFICATION_DATA_SIZE)
+        identification = Camera._parseIdentification(identification)
+
+        type, firmwareRelease = await self._query(comm._getPacket(comm._commandWithoutData(COMMAND_GET_FIRMWARE_RELEASE)), FIRMWARE_RELEASE_DATA_SIZE)
+        firmwareRelease = Camera._parseFirmwareRelease(firmwareRelease)
+
+        type, chipInformation = await self._query(comm._getPacket(comm._commandWithoutData(COMMAND_GET_CHIP_INFORMATION)), CHIP_INFORMATION_DATA_SIZE)
+        chipInformation = Camera._parseChipInformation(chipInformation)
+
+        return Camera._composeInfo(identification, firmwareRelease, chipInformation, Camera._roiResolution(comm), comm._ser.port)
+
+    async def configure(self, config=None, force=False, **parameters) :
+        '''
+        Validate and apply a set of parameters at once, see Camera.configure(config, force, **parameters).
+        '''
+        if config is None :
+            config = CameraConfig(**parameters)
+
+        config._validateWith(self)
+
+        for key, type in await self._apply(lambda: config._apply(self._camera, force)) :
+            if type != DATA_ACK :
+                if isinstance(key, tuple) :
+                    key = "%s[%d]" % key
+                raise ConfigurationError(key, "not acknowledged by the camera")
+
+    async def setModulationFrequency(self, frequency, force=False) :
+        '''
+        Set Modulation Frequency, see Camera.setModulationFrequency(frequency).
+        '''
+        await self._apply(lambda: self._camera.setModulationFrequency(frequency, force))
+
+    async def setModulationChannel(self, channel, force=False) :
+        '''
+        Set Modulation Channel, see Camera.setModulationChannel(channel).
+        '''
+        await self._apply(lambda: self._camera.setModulationChannel(channel, force))
+
+    async def setMode(self, mode, force=False) :
+        '''
+        Set camera mode, see Camera.setMode(mode).
+        '''
+        await self._apply(lambda: self._camera.setMode(mode, force))
+
+    async def setHdr(self, hdr, force=False) :
+        '''
+        Set HDR mode, see Camera.setHdr(hdr).
+        '''
+        await self._apply(lambda: self._camera.setHdr(hdr, force))
+
+    async def setIntegrationTime3d(self, index, t, force=False) :
+        '''
+        Set Integration Time, see Camera.setIntegrationTime3d(index, t).
+        '''
+        await self._apply(lambda: self._camera.setIntegrationTime3d(index, t, force))
+
+    async def setIntegrationTimeGrayscale(self, t, force=False) :
+        '''
+        Set Integration Time for Grayscale, see Camera.setIntegrationTimeGrayscale(t).
+        '''
+        await self._apply(lambda: self._camera.setIntegrationTimeGrayscale(t, force))
+
+    async def setMinimalAmplitude(self, index, t, force=False) :
+        '''
+        Set MinimalAmplitude, see Camera.setMinimalAmplitude(index, t).
+        '''
+        await self._apply(lambda: self._camera.setMinimalAmplitude(index, t, force))
+
+    async def setOffset(self, offset, force=False) :
+        '''
+        Set distance offset, see Camera.setOffset(offset).
+        '''
+        await self._apply(lambda: self._camera.setOffset(offset, force))
+
+    async def setRoi(self, x0, y0, x1, y1, force=False) :
+        '''
+        Set ROI, see Camera.setRoi(x0, y0, x1, y1).
+        '''
+        await self._apply(lambda: self._camera.setRoi(x0, y0, x1, y1, force))
+
+    async def setTemporalFilter(self, factor, threshold, edgeThreshold=0, force=False) :
+        '''
+        Set temporal filter, see Camera.setTemporalFilter(factor, threshold, edgeThreshold).
+        '''
+        await self._apply(lambda: self._camera.setTemporalFilter(factor, threshold, edgeThreshold, force))
+
+    async def setSingleSpotFilter(self, factor, threshold, force=False) :
+        '''
+        Set temporal filter of the single spot, see Camera.setSingleSpotFilter(factor, threshold).
+        '''
+        await self._apply(lambda: self._camera.setSingleSpotFilter(factor, threshold, force))
+
+    async def setGaussianFilter(self, enabled, force=False) :
+        '''
+        Set Gaussian filter, see Camera.setGaussianFilter(enabled).
+        '''
+        await self._apply(lambda: self._camera.setGaussianFilter(enabled, force))
+
+    async def setDcsFilter(self, enabled, force=False) :
+        '''
+        Set DCS filter, see Camera.setDcsFilter(enabled).
+        '''
+        await self._apply(lambda: self._camera.setDcsFilter(enabled, force))
+
+    async def setFrameRate(self, frameRate, force=False) :
+        '''
+        Limit the frame rate, see Camera.setFrameRate(frameRate).
+        '''
+        await self._apply(lambda: self._camera.setFrameRate(frameRate, force))
+
+    async def readFrameRawData(self, frameType, pooled=False) :
+        '''
+        To request raw data of a frame from camera, see Camera.readFrameRawData(frameType, pooled).
+        '''
+        if frameType not in _FRAME_COMMANDS :
+            raise Exception("Unsupported frame type: %s" % frameType)
+
+        comm = self._comm
+        command = _FRAME_COMMANDS[frameType]
+
+        type, dataArray = await self._query(comm._acquisitionPackets[(command, AUTO_REPEAT)], comm._getFrameDataSize(command))
+
+        header, dataArray = Camera._splitFrameData(dataArray, pooled)
+        return dataArray
+
+    async def readFrame(self, frameType=FrameType.DISTANCE_GRAYSCALE) :
+        '''
+        A convenient method to directly get a new Frame object, see Camera.readFrame(frameType).
+        '''
+        dataArray = await self.readFrameRawData(frameType)
+
+        return self._camera._composeLazyFrame(dataArray, frameType)
+
+    def stream(self, frameType=FrameType.DISTANCE_GRAYSCALE, raw=False) :
+        '''
+        Iterate over the frames of the camera in stream mode, see Camera.stream(frameType).
+
+            async with camera.stream(FrameType.DISTANCE) as frames:
+                async for frame in frames:
+                    ...
+
+        The stream is stopped when the async with block is left, even by break or an exception. Without the
+        async with block the stream starts with the first frame and runs until stopStream() is awaited.
+
+        Parameters
+        ----------
+        frameType : FrameType
+            type of frames to stream.
+        raw : bool
+            yield the raw data of the frames, as returned by readFrameRawData(frameType), instead of Frame objects.
+
+        Returns
+        ----------
+        AsyncStream
+            An async iterator of the frames, and an async context manager stopping the stream on exit.
+        '''
+        if frameType not in _FRAME_COMMANDS :
+            raise Exception("Unsupported frame type: %s" % frameType)
+
+        return AsyncStream(self, frameType, raw)
+
+    async def _startStream(self, frameType) :
+
+        self._checkIdle()
+
+        comm = self._comm
+        command = _FRAME_COMMANDS[frameType]
+
+        async with self._lock :
+            self._streamSize = comm._getFrameDataSize(command)
+            comm._ser.write(comm._acquisitionPackets[(command, STREAM)])
+            self._streaming = True
+
+    async def _readStream(self, frameType, raw) :
+
+        async with self._lock :
+            while self._streaming :
+                type, dataArray = await self._read(self._streamSize)
+
+                header, dataArray = Camera._splitFrameData(dataArray, False)
+                if len(dataArray) == 0 :
+                    continue
+
+                if raw :
+                    return dataArray
+
+                frame = self._camera._composeLazyFrame(dataArray, frameType)
+                if frame :
+                    return frame
+
+        return None
+
+    async def stopStream(self) :
+        '''
+        Stop stream mode and discard the frames still in flight, the iteration of stream(frameType) ends.
+        '''
+        if not self._streaming :
+            return
+
+        ## a frame being read completes first, the stream then ends
+        self._streaming = False
+
+        comm = self._comm
+        async with self._lock :
+            if comm._ser.is_open :
+                comm._sendStopStream()
+                await asyncio.sleep(STREAM_STOP_DELAY)
+                comm._flushStream()
+
+    @staticmethod
+    def composeFrame(dataArray, frameType, roi=None, hdr=HDR_OFF) :
+        '''
+        Convenient method to compose Frame using raw bytearray data, see Camera.composeFrame(dataArray, frameType, roi, hdr).
+        '''
+        return Camera.composeFrame(dataArray, frameType, roi, hdr)
+
+
+class AsyncStream :
+    '''
+    Frames of an AsyncCamera in stream mode, see AsyncCamera.stream(frameType, raw).
+    '''
+
+    def __init__(self, camera, frameType, raw) :
+        self._camera = camera
+        self._frameType = frameType
+        self._raw = raw
+        self._started = False
+
+    async def __aenter__(self) :
+        await self._start()
+        return self
+
+    async def __aexit__(self, *exc) :
+        await self._camera.stopStream()
+
+    def __aiter__(self) :
+        return self
+
+    async def __anext__(self) :
+        await self._start()
+
+        frame = await self._camera._readStream(self._frameType, self._raw)
+        if frame is None :
+            raise StopAsyncIteration
+
+        return frame
+
+    async def _start(self) :
+
+        if not self._started :
+            self._started = True
+            await self._camera._startStream(self._frameType)
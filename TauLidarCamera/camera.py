@@ -6,8 +6,28 @@ from .communication import Communication
 from TauLidarCommon.d3 import FrameBuilder
 from TauLidarCommon.color import ColorMode, Color
 from .info import CameraInfo
+from .capture import CapturePolicy, FrameCapture
+from .config import CameraConfig, ConfigurationError
+from .decoder import DecodedFrame, ExtendedFrameType, decodeFrame, frameShape
+from .colorizer import DepthColorizer
+from .projector import PointCloudProjector, rayTable
+from .frame import LazyFrame
+from .hdr import mergeFrames
 from TauLidarCommon.frame import FrameType, Frame
 
+## acquisition command of each FrameType
+_FRAME_COMMANDS = {
+    FrameType.DISTANCE:           COMMAND_GET_DISTANCE,
+    FrameType.DISTANCE_GRAYSCALE: COMMAND_GET_DISTANCE_GRAYSCALE,
+    FrameType.DISTANCE_AMPLITUDE: COMMAND_GET_DISTANCE_AMPLITUDE,
+    ExtendedFrameType.AMPLITUDE:              COMMAND_GET_AMPLITUDE,
+    ExtendedFrameType.GRAYSCALE:              COMMAND_GET_GRAYSCALE,
+    ExtendedFrameType.DCS:                    COMMAND_GET_DCS,
+    ExtendedFrameType.DCS_DISTANCE_AMPLITUDE: COMMAND_GET_DCS_DISTANCE_AMPLITUDE,
+}
+
+_FULL_ROI = (0, 0, TOF_635_IMAGE_WIDTH - 1, TOF_635_IMAGE_HEIGHT - 1)
+
 class Camera :
     '''
     ToF camera class, access point to the ToF camera.
@@ -20,12 +40,18 @@ class Camera :
     '''
 
     _frameBuilder = FrameBuilder()
+    _colorizer = DepthColorizer()
 
     def __init__(self):
         self._comm = Communication()
+        self._streamFrameType = None
+        self._capture = None
+        self._captureFrameType = None
+        self._info = None
+        self._projector = None
 
     @staticmethod
-    def open(port=None):
+    def open(port=None, registry=None):
         '''
         open communication to the camera via serial port.
 
@@ -38,6 +64,9 @@ class Camera :
         ----------
         port : str, optional
             serial port the camera connected. if there is no port given, the first available camera will be used.
+        registry : DeviceRegistry, optional
+            registry of known cameras, a camera already registered on the port is verified with a single request
+            instead of reading all its information, a new camera is added to the registry.
 
         Returns
         ----------
@@ -51,17 +80,21 @@ class Camera :
         '''
 
         camera = Camera()
-        return camera._open(port)
+        return camera._open(port, registry)
 
     @staticmethod
-    def scan():
+    def scan(timeout=SCAN_TIMEOUT, usbIds=None):
         '''
-        scan for available Tau LiDAR cameras
+        scan for available Tau LiDAR cameras, the serial ports are probed in parallel.
 
 
         Parameters
         ----------
-        None
+        timeout : float, optional
+            seconds to wait for each port to identify itself.
+        usbIds : list, optional
+            (vid, pid) tuples of the USB devices to probe, when none is connected the ports without USB
+            information are probed. By default all serial ports are probed.
 
         Returns
         ----------
@@ -71,9 +104,31 @@ class Camera :
         '''
 
         camera = Camera()
-        return camera._comm.scan()
+        return camera._comm.scan(timeout, usbIds)
+
+    @staticmethod
+    def discover(timeout=SCAN_TIMEOUT, usbIds=None):
+        '''
+        scan for available Tau LiDAR cameras like scan(), and read the information of each camera found,
+        so there is no need to open a camera to get its information.
+
+        Returns
+        ----------
+        list
+            A list of CameraInfo, one for each Tau camera found.
+        '''
+
+        def probe(comm) :
+            if not comm._isTauDevice() :
+                return None
 
-    def _open(self, port=None):
+            camera = Camera()
+            camera._comm = comm
+            return camera.info()
+
+        return Communication._discover(probe, timeout, usbIds)
+
+    def _open(self, port=None, registry=None):
 
         if self._comm._ser.is_open :
             raise Exception("Camera is already opened!")
@@ -82,41 +137,78 @@ class Camera :
 
         if self._comm._ser.is_open: 
             self.setDefaultParameters()
+            self._info = self._verifyInfo(registry) if registry is not None else self._readInfo()
 
         return self
 
-    def info(self):
+    def _readInfo(self):
+
+        return Camera._composeInfo(self.getIdentification(), self.getFirmwareRelease(), self.getChipInformation(),
+                                   self._resolution(), self._comm._ser.port)
+
+    def _verifyInfo(self, registry):
+
+        port = self._comm._ser.port
+        info = registry.lookup(port)
+
+        if info is not None :
+            ## the uid tells whether it is still the same camera on the port
+            if info.uid == "%02X%04X" % self.getChipInformation() :
+                info.resolution = self._resolution()
+                return info
+
+        info = self._readInfo()
+        registry.update(info)
+
+        return info
+
+    def _resolution(self):
+        return Camera._roiResolution(self._comm)
+
+    @staticmethod
+    def _roiResolution(comm):
+        return "%dx%d" % (comm._xMax - comm._xMin + 1, comm._yMax - comm._yMin + 1)
+
+    def info(self, refresh=False):
         '''
         get camera information, such as model, firmware version, uid, resolution and serial port name.
 
+        The information is read from the camera once when it is opened, and cached afterwards.
+
+        Parameters
+        ----------
+        refresh : bool, optional
+            read the information from the camera again.
+
         Returns
         ----------
         CameraInfo
             An instance of CameraInfo contains model, firmware version, uid, resolution and serial port name.
         '''
 
-        chipType, chipVersion = self.getIdentification()
-        model = "%d.%d" % (chipType, chipVersion)
-
-        major, minor = self.getFirmwareRelease()
-        firmware = "%d.%d" % (major, minor)
-
-        waferId, chipId = self.getChipInformation()
-        uid = "%02X%04X" % (waferId, chipId)
+        if self._info is None or refresh :
+            self._info = self._readInfo()
 
-        return CameraInfo(model, firmware, uid, "160x60",  self._comm._ser.port)
+        info = self._info
+        return CameraInfo(info.model, info.firmware, info.uid, self._resolution(), info.port)
 
     def close(self) :
         '''
         Close communication to the camera.
         '''
 
+        self.stopCapture()
         self._comm.close()
+        self._streamFrameType = None
+        self._info = None
 
     def setDefaultParameters(self) :
         '''
         Convenient method to set default parameters to control the ToF camera. You may set those parameters
         in your own application.
+
+        The camera remembers the values acknowledged by the ToF camera, setting a parameter again to the same
+        value does not send anything, unless force=True is given to the setter.
         '''
         self.setModulationFrequency(VALUE_20MHZ) ## frequency: 20MHZ
         self.setModulationChannel(0)             ## autoChannelEnabled: 0, channel: 0
@@ -128,68 +220,267 @@ class Camera :
         self.setOffset(0)                        ## set distance offset: 0
         self.setRoi(0, 0, 159, 59)               ## set ROI to max width and height
 
-    def setModulationFrequency(self, frequency):
+    def configure(self, config=None, force=False, **parameters) :
+        '''
+        Validate and apply a set of parameters at once.
+
+        The parameters may be given as a CameraConfig or as keyword arguments of CameraConfig:
+
+            camera.configure(integrationTime3d=1000, minimalAmplitude=10)
+
+        All parameters are validated before anything is sent, then the commands of the changed parameters
+        are sent back to back and the replies are collected afterwards, instead of a full round-trip per parameter.
+
+        Raises
+        ----------
+        ConfigurationError
+            A parameter is invalid or was not acknowledged by the camera, its name is in the parameter attribute.
+        '''
+        if config is None :
+            config = CameraConfig(**parameters)
+
+        config._validateWith(self)
+
+        self._comm.beginBatch()
+        try:
+            config._apply(self, force)
+        except:
+            self._comm.cancelBatch()
+            raise
+
+        for key, type in self._comm.endBatch() :
+            if type != DATA_ACK :
+                if isinstance(key, tuple) :
+                    key = "%s[%d]" % key
+                raise ConfigurationError(key, "not acknowledged by the camera")
+
+    def setModulationFrequency(self, frequency, force=False):
         '''
         Set Modulation Frequency, for wide view image, it has to be set to VALUE_20MHZ.
         '''
-        self._comm.setModulationFrequency(frequency)
+        self._comm.setModulationFrequency(frequency, force)
 
-    def setModulationChannel(self, channel):
+    def setModulationChannel(self, channel, force=False):
         '''
         Set Modulation Channel, for multiple cameras, you may set them work in different channels, 
         however if you have only one, set it to 0.
         '''
-        self._comm.setModulationChannel(0, channel)
+        self._comm.setModulationChannel(0, channel, force)
 
-    def setMode(self, mode):
+    def setMode(self, mode, force=False):
         '''
         Set camera mode. Currently supports wide view iamge only, which is 0.
         '''
-        self._comm.setMode(mode)
+        self._comm.setMode(mode, force)
+
+    def setHdr(self, hdr, force=False):
+        '''
+        Set HDR mode, to measure dark and bright targets of the same scene.
+
+        HDR_SPATIAL: the rows of the sensor alternate between integration times 0 and 1, and the camera merges each
+        pair of rows. Frames are read in a single acquisition with half the rows of the ROI, use a ROI with an even
+        number of rows.
+
+        HDR_TEMPORAL: consecutive acquisitions cycle through the integration times set with setIntegrationTime3d(index, t),
+        read merged frames with readHdrFrame(count, frameType).
+
+            camera.setIntegrationTime3d(0, 1000)
+            camera.setIntegrationTime3d(1, 100)
+            camera.setHdr(HDR_TEMPORAL)
+
+            decoded = camera.readHdrFrame(2, FrameType.DISTANCE_AMPLITUDE)
+
+        Parameters
+        ----------
+        hdr : int
+            HDR_OFF, HDR_SPATIAL or HDR_TEMPORAL.
+
+        Raises
+        ----------
+        ConfigurationError
+            The mode is not one of the above, or HDR_SPATIAL with the current ROI of an odd number of rows.
+        '''
+        CameraConfig(hdr=hdr)._validateWith(self)
+
+        self._comm.setHdr(hdr, force)
 
-    def setHdr(self, hdr):
+    def hdr(self):
         '''
-        Set HDR mode. Currently not supported.
+        get the HDR mode acknowledged by the camera, HDR_OFF by default.
         '''
-        self._comm.setHdr(hdr)
+        return self._comm._hdr
 
-    def setIntegrationTime3d(self, index, t):
+    def setIntegrationTime3d(self, index, t, force=False):
         '''
         Set Integration Time. 
         Integration Time could be from 0 to 1000, depends on the surface reflectivity and distance of the target object, 
         for an object in about 2-3 meters, you may try set it to 800.
+        AutoExposure, in TauLidarCamera.exposure, adjusts it to the scene from the amplitude of the frames.
+        '''
+        self._comm.setIntegrationTime3d(index, t, force)
+
+    def integrationTime3d(self, index=0):
+        '''
+        get the integration time acknowledged by the camera, see setIntegrationTime3d(index, t).
+
+        Returns
+        ----------
+        int
+            integration time of the index, or None if it was not acknowledged since the camera was opened,
+            getIntegrationTime3d() then requests it from the camera.
         '''
-        self._comm.setIntegrationTime3d(index, t)
+        return self._comm._parameters.get(('integrationTime3d', index))
 
-    def setIntegrationTimeGrayscale(self, t):
+    def setIntegrationTimeGrayscale(self, t, force=False):
         '''
         Set Integration Time for Grayscale. 
         If you request distance/depth plus grayscale image, you need set approriate “integration time grayscale”, 
-        maximum allowed 25000, for example, regular in-door environment, set it to 8000.
+        maximum allowed VALUE_INTEGRATION_TIME_GRAYSCALE_MAX (25000), for example, regular in-door environment, set it to 8000.
         '''
-        self._comm.setIntegrationTimeGrayscale(t)
+        self._comm.setIntegrationTimeGrayscale(t, force)
 
-    def setMinimalAmplitude(self, index, t):
+    def setMinimalAmplitude(self, index, t, force=False):
         '''
         Set MinimalAmplitude. 
         MinimalAmplitude is the noise level minimum threshold, 
         for an object in about 2-3 meters in in-door environment, you may try set it to 60.
         '''
-        self._comm.setMinimalAmplitude(index, t)
+        self._comm.setMinimalAmplitude(index, t, force)
 
-    def setOffset(self, offset):
+    def setOffset(self, offset, force=False):
         '''
         Set distance offset. 
         Normally this set it to 0.
         '''
-        self._comm.setOffset(offset)
+        self._comm.setOffset(offset, force)
+
+    def setRoi(self, x0, y0, x1, y1, force=False):
+        '''
+        Set ROI, the region of interest of the sensor read out in each frame.
+
+        Only the pixels of the ROI are transferred, a smaller ROI reduces the frame size and raises the frame rate.
+        For example, a band of 20 rows of the full width:
+
+            camera.setRoi(0, 20, 159, 39)
 
-    def setRoi(self, x0, y0, x1, y1):
+        Once acknowledged by the camera, frames are read with the size of the ROI and the Frame, DecodedFrame
+        and point cloud width and height are those of the ROI.
+
+        Parameters
+        ----------
+        x0, y0 : int
+            first column 0 - 159 and row 0 - 59.
+        x1, y1 : int
+            last column x0 - 159 and row y0 - 59, included.
+
+        Raises
+        ----------
+        ConfigurationError
+            The ROI is out of the sensor, or has an odd number of rows in HDR_SPATIAL mode.
         '''
-        Set ROI. 
-        Currently not supported.
+        CameraConfig(roi=(x0, y0, x1, y1))._validateWith(self)
+
+        self._comm.setRoi(x0, y0, x1, y1, force)
+
+    def setTemporalFilter(self, factor, threshold, edgeThreshold=0, force=False):
         '''
-        self._comm.setRoi(x0, y0, x1, y1)
+        Set the temporal filter of the camera, which averages the distance of each pixel over the frames,
+        and the edge detection, which flags the pixels on the edges of objects with VALUE_EDGE_DETECTED.
+
+        A pixel is filtered as distance = factor * new + (1 - factor) * previous, unless its distance changed
+        by more than threshold, then the new distance is taken as is, so moving objects do not leave a trail.
+
+            camera.setTemporalFilter(300, 300)   ## 0.3 of the new frame, up to 300 mm changes
+
+        Parameters
+        ----------
+        factor : int
+            weight of the new frame 0 - 1000 for 0.0 - 1.0, 0 disables the filter.
+        threshold : int
+            distance change in millimeters 0 - 65535.
+        edgeThreshold : int, optional
+            edge detection threshold 0 - 65535, 0 disables the edge detection.
+
+        Raises
+        ----------
+        ConfigurationError
+            A value is out of range.
+        '''
+        CameraConfig(temporalFilter=(factor, threshold, edgeThreshold)).validate()
+
+        self._comm.setTemporalFilter(factor, threshold, edgeThreshold, force)
+
+    def setSingleSpotFilter(self, factor, threshold, force=False):
+        '''
+        Set the temporal filter of the single spot mode, see setTemporalFilter(factor, threshold).
+
+        Raises
+        ----------
+        ConfigurationError
+            A value is out of range.
+        '''
+        CameraConfig(singleSpotFilter=(factor, threshold)).validate()
+
+        self._comm.setSingleSpotFilter(factor, threshold, force)
+
+    def setGaussianFilter(self, enabled, force=False):
+        '''
+        Enable or disable the Gaussian filter of the camera, which smooths the distance image spatially.
+
+        Raises
+        ----------
+        ConfigurationError
+            enabled is not True or False.
+        '''
+        CameraConfig(gaussianFilter=enabled).validate()
+
+        self._comm.setGaussianFilter(enabled, force)
+
+    def setDcsFilter(self, enabled, force=False):
+        '''
+        Enable or disable the DCS filter of the camera, which filters the raw DCS samples before the distance is computed.
+
+        Raises
+        ----------
+        ConfigurationError
+            enabled is not True or False.
+        '''
+        CameraConfig(dcsFilter=enabled).validate()
+
+        self._comm.setDcsFilter(enabled, force)
+
+    def setFrameRate(self, frameRate, force=False):
+        '''
+        Limit the frame rate of the camera, frames are then acquired and sent at most frameRate times per second.
+
+        In stream mode the camera sends fewer frames, which reduces the USB traffic and the host CPU load
+        without dropping any frame, the stream is simply slower.
+
+        Parameters
+        ----------
+        frameRate : int
+            maximum frames per second 1 - 65535, 0 for no limit.
+
+        Raises
+        ----------
+        ConfigurationError
+            frameRate is out of range.
+        '''
+        CameraConfig(frameRate=frameRate).validate()
+
+        self._comm.setFrameRate(frameRate, force)
+
+    def roi(self):
+        '''
+        get the ROI acknowledged by the camera.
+
+        Returns
+        ----------
+        tuple
+            (x0, y0, x1, y1), the full sensor (0, 0, 159, 59) by default.
+        '''
+        comm = self._comm
+        return (comm._xMin, comm._yMin, comm._xMax, comm._yMax)
 
     @staticmethod
     def setColorMode(colorMode):
@@ -198,6 +489,7 @@ class Camera :
         To use distance or grayscle for point cloud color.
         '''
         Camera._frameBuilder.setColorMode(colorMode)
+        Camera._colorizer.setColorMode(colorMode)
 
     @staticmethod
     def setRange(z1, z2):
@@ -206,39 +498,72 @@ class Camera :
         To use distance for point cloud color, set the distance range.
         '''
         Camera._frameBuilder.setRange(z1, z2)
+        Camera._colorizer.setRange(z1, z2)
 
     def getChipInformation(self) :
         '''
         request Chip Information.
         '''
-        dataArray = self._comm.getChipInformation()
-        waferId = getUint16LittleEndian(dataArray, INDEX_WAFER_ID - COMMAND_SIZE_HEADER)
-        chipId  = getUint16LittleEndian(dataArray, INDEX_CHIP_ID  - COMMAND_SIZE_HEADER)
-
-        return (waferId, chipId)
+        return Camera._parseChipInformation(self._comm.getChipInformation())
 
     def getIdentification(self) :
         '''
         request Identification.
         '''
-        dataArray = self._comm.getIdentification()
+        return Camera._parseIdentification(self._comm.getIdentification())
+
+    def getFirmwareRelease(self) :
+        '''
+        request Firmware Release.
+        '''
+        return Camera._parseFirmwareRelease(self._comm.getFirmwareRelease())
+
+    def getIntegrationTime3d(self) :
+        '''
+        request the integration time used by the camera, see setIntegrationTime3d(index, t).
+
+        Returns
+        ----------
+        int
+            integration time, or None if the camera did not answer.
+        '''
+        dataArray = self._comm.getIntegrationTime3d()
+        if len(dataArray) < INTEGRATION_TIME_DATA_SIZE :
+            return None
+
+        return getUint16LittleEndian(dataArray, 0)
+
+    @staticmethod
+    def _parseChipInformation(dataArray) :
+        waferId = getUint16LittleEndian(dataArray, INDEX_WAFER_ID - COMMAND_SIZE_HEADER)
+        chipId  = getUint16LittleEndian(dataArray, INDEX_CHIP_ID  - COMMAND_SIZE_HEADER)
+
+        return (waferId, chipId)
+
+    @staticmethod
+    def _parseIdentification(dataArray) :
         identificationValue = int(binascii.hexlify(dataArray), 16)
         chipType = (identificationValue & MASK_CHIP_TYPE_DEVICE) >> SHIFT_CHIP_TYPE_DEVICE
         chipVersion = (identificationValue & MASK_VERSION) >> SHIFT_VERSION
 
         return (chipType, chipVersion)
 
-    def getFirmwareRelease(self) :
-        '''
-        request Firmware Release.
-        '''
-        dataArray = self._comm.getFirmwareRelease()
+    @staticmethod
+    def _parseFirmwareRelease(dataArray) :
         firmware = getUint32LittleEndian(dataArray, 0)
         major = getValueMsb(firmware)
         minor = getValueLsb(firmware)
         return (major, minor)
 
-    def readFrameRawData(self, frameType) :
+    @staticmethod
+    def _composeInfo(identification, firmwareRelease, chipInformation, resolution, port) :
+        model = "%d.%d" % identification
+        firmware = "%d.%d" % firmwareRelease
+        uid = "%02X%04X" % chipInformation
+
+        return CameraInfo(model, firmware, uid, resolution, port)
+
+    def readFrameRawData(self, frameType, pooled=False) :
         '''
         To request raw data of a frame from camera.
 
@@ -248,15 +573,28 @@ class Camera :
 
         You may simply call readFrame(frameType) to obtain a Frame object without using this method if the frame rate is not critical.
 
+        By default the raw data is copied out of the receive buffer. With pooled=True a memoryview into the receive buffer is
+        returned instead, which saves the copy but is only valid until the next read from the camera.
+
         FrameType.DISTANCE: depth data only
 
         FrameType.DISTANCE_GRAYSCALE: depth data plus grayscale
 
         FrameType.DISTANCE_AMPLITUDE: depth data plus amplitude
 
+        The ExtendedFrameType frames can not be composed into a Frame, decode them with decodeFrame(dataArray, frameType):
+
+        ExtendedFrameType.AMPLITUDE: amplitude only, half the size of FrameType.DISTANCE_AMPLITUDE
+
+        ExtendedFrameType.GRAYSCALE: grayscale only, a third of the size of FrameType.DISTANCE_GRAYSCALE
+
+        ExtendedFrameType.DCS: the 4 raw DCS images, to compute the distance on the host
+
+        ExtendedFrameType.DCS_DISTANCE_AMPLITUDE: the 4 raw DCS images plus depth data and amplitude
+
         Returns
         ----------
-        bytearray
+        bytearray or memoryview
             Length of the raw data will be different depends on the frameType specified:
 
         FrameType.DISTANCE: 2 bytes 32 float distance for each data point, 160 (image width) x 160 (image height) x 2;
@@ -264,22 +602,76 @@ class Camera :
         FrameType.DISTANCE_GRAYSCALE: 2 bytes 32 float distance and 1 byte unit 8 grayscale for each data point, 160 (image width) x 160 (image height) x (2 + 1);
 
         FrameType.DISTANCE_AMPLITUDE: 2 bytes 32 float distance and 2 bytes 32 float amplitude for each data point, 160 (image width) x 160 (image height) x (2 + 2);
+
+        ExtendedFrameType.AMPLITUDE: 2 bytes amplitude for each data point;
+
+        ExtendedFrameType.GRAYSCALE: 1 byte grayscale for each data point;
+
+        ExtendedFrameType.DCS: 4 images of 2 bytes DCS for each data point;
+
+        ExtendedFrameType.DCS_DISTANCE_AMPLITUDE: 4 images of 2 bytes DCS, then 2 bytes distance and 2 bytes amplitude for each data point;
         '''
-        
+
+        header, dataArray = self.readFrameHeaderAndRawData(frameType, pooled=True)
+        if dataArray is None :
+            return None
+
+        return dataArray if pooled else bytearray(dataArray)
+
+    def readFrameHeaderAndRawData(self, frameType, pooled=False) :
+        '''
+        To request a frame from camera, same as readFrameRawData(frameType, pooled) but also returns the
+        TOF_635_IMAGE_HEADER_SIZE bytes image header sent by the camera in front of the raw data.
+
+        Returns
+        ----------
+        tuple
+            (header, dataArray), both memoryviews into the receive buffer if pooled is True, bytearrays otherwise.
+        '''
+
+        if self._comm._streaming :
+            raise Exception("Camera is streaming, use readStreamFrameRawData() or stopStream() first!")
+
         if frameType == FrameType.DISTANCE_GRAYSCALE:
-            dataArray = self._comm.getDistanceGrayscale()
-            return dataArray[TOF_635_IMAGE_HEADER_SIZE : len(dataArray)]
+            dataArray = self._comm.getDistanceGrayscale(pooled=True)
 
         elif frameType == FrameType.DISTANCE_AMPLITUDE:
-            dataArray = self._comm.getDistanceAmplitude()
-            return dataArray[TOF_635_IMAGE_HEADER_SIZE : len(dataArray)]
+            dataArray = self._comm.getDistanceAmplitude(pooled=True)
 
         elif frameType == FrameType.DISTANCE:
-            dataArray = self._comm.getDistance()
-            return dataArray[TOF_635_IMAGE_HEADER_SIZE : len(dataArray)]
+            dataArray = self._comm.getDistance(pooled=True)
+
+        elif frameType == ExtendedFrameType.AMPLITUDE:
+            dataArray = self._comm.getAmplitude(pooled=True)
+
+        elif frameType == ExtendedFrameType.GRAYSCALE:
+            dataArray = self._comm.getGrayscale(pooled=True)
+
+        elif frameType == ExtendedFrameType.DCS:
+            dataArray = self._comm.getDcs(pooled=True)
+
+        elif frameType == ExtendedFrameType.DCS_DISTANCE_AMPLITUDE:
+            dataArray = self._comm.getDcsDistanceAmplitude(pooled=True)
+
+        else:
+            return (None, None)
+
+        return Camera._splitFrameData(dataArray, pooled)
+
+    @staticmethod
+    def _splitFrameData(dataArray, pooled) :
+
+        view = memoryview(dataArray)
+        header = view[0 : TOF_635_IMAGE_HEADER_SIZE]
+        dataArray = view[TOF_635_IMAGE_HEADER_SIZE : len(view)]
+
+        if not pooled :
+            return (bytearray(header), bytearray(dataArray))
+
+        return (header, dataArray)
 
     @staticmethod
-    def composeFrame(dataArray, frameType) :
+    def composeFrame(dataArray, frameType, roi=None, hdr=HDR_OFF) :
         '''
         Convenient method to compose Frame using raw bytearray data.
 
@@ -291,6 +683,10 @@ class Camera :
 
         FrameType.DISTANCE_AMPLITUDE: distance / depth plus amplitude
 
+        Raw data read with a ROI smaller than the sensor must be given the ROI, see Camera.roi(), the Frame is
+        then a LazyFrame of the width and height of the ROI. Raw data read with HDR_SPATIAL must be given the HDR
+        mode, see Camera.hdr(), the Frame has half the rows of the ROI.
+
         Returns
         ----------
         Frame
@@ -308,8 +704,151 @@ class Camera :
 
             FrameType.DISTANCE_AMPLITUDE: data_amplitude.
         '''
-        
-        return Camera._frameBuilder.composeFrame(dataArray, frameType)
+        if not isinstance(frameType, FrameType) :
+            raise Exception("%s frames can not be composed, use decodeFrame(dataArray, frameType)" % frameType.name)
+
+        if hdr != HDR_SPATIAL and (roi is None or tuple(roi) == _FULL_ROI) :
+            return Camera._frameBuilder.composeFrame(dataArray, frameType)
+
+        x0, y0, x1, y1 = roi if roi is not None else _FULL_ROI
+        width, height, rows = frameShape(roi, hdr)
+
+        return LazyFrame.compose(dataArray, frameType, rayTable(x0, y0, x1, y1, rows), Camera._colorizer, width, height)
+
+    @staticmethod
+    def decodeFrame(dataArray, frameType, roi=None, hdr=HDR_OFF) :
+        '''
+        Convenient method to decode raw data into typed NumPy arrays, without copying the data.
+
+        Raw data read with a ROI smaller than the sensor must be given the ROI, see Camera.roi(), and raw data
+        read with HDR_SPATIAL the HDR mode, see Camera.hdr().
+
+        Much faster than composeFrame(dataArray, frameType) when only the images are needed:
+
+            decoded = Camera.decodeFrame(camera.readFrameRawData(FrameType.DISTANCE_AMPLITUDE), FrameType.DISTANCE_AMPLITUDE)
+
+            mat_depth = decoded.depth()          ## uint16 distance in millimeters
+            mat_amplitude = decoded.amplitude    ## uint16 amplitude
+
+        Returns
+        ----------
+        DecodedFrame
+            An instance of DecodedFrame with (height, width) arrays:
+
+                distance,
+                grayscale (FrameType.DISTANCE_GRAYSCALE only),
+                amplitude (FrameType.DISTANCE_AMPLITUDE only)
+
+            The ExtendedFrameType frames have the arrays of their data and the DCS images, see DecodedFrame.
+        '''
+
+        width, height, rows = frameShape(roi, hdr)
+
+        return decodeFrame(dataArray, frameType, width, height)
+
+    @staticmethod
+    def colorize(decoded, out=None) :
+        '''
+        Convenient method to color the distance of a decoded frame, with the range and ColorMode set by
+        Camera.setRange(z1, z2) and Camera.setColorMode(colorMode).
+
+        The colors come from a lookup table computed once per range and ColorMode, reuse the output buffer to
+        avoid any allocation per frame:
+
+            image = np.empty((60, 160, 3), dtype=np.uint8)
+
+            decoded = Camera.decodeFrame(camera.readFrameRawData(FrameType.DISTANCE), FrameType.DISTANCE)
+            Camera.colorize(decoded, out=image)
+
+        Returns
+        ----------
+        numpy.ndarray
+            (height, width, 3) uint8 BGR image, see DepthColorizer.colorize(decoded, out).
+        '''
+
+        return Camera._colorizer.colorize(decoded, out)
+
+    def projectPoints(self, decoded, out=None, minAmplitude=None, mask=None) :
+        '''
+        Compute the point cloud of a decoded frame of this camera, much faster than Frame.points_3d.
+
+        The ray of each pixel is computed once for the ROI set by setRoi(x0, y0, x1, y1), reuse the output buffer
+        to avoid any allocation per frame:
+
+            points = np.empty((9600, 3), dtype=np.float32)
+
+            decoded = Camera.decodeFrame(camera.readFrameRawData(FrameType.DISTANCE_AMPLITUDE), FrameType.DISTANCE_AMPLITUDE)
+            points, valid = camera.projectPoints(decoded, out=points, minAmplitude=80)
+
+        Returns
+        ----------
+        tuple
+            (points, valid), see PointCloudProjector.project(decoded, out, minAmplitude, mask).
+        '''
+        return self._roiProjector().project(decoded, out, minAmplitude, mask)
+
+    def _roiProjector(self, roi=None, hdr=None) :
+
+        if self._projector is None :
+            self._projector = PointCloudProjector()
+
+        if roi is None :
+            roi, hdr = self.roi(), self.hdr()
+
+        width, height, rows = frameShape(roi, hdr)
+        self._projector.setRoi(*roi, rows)
+
+        return self._projector
+
+    def _composeLazyFrame(self, dataArray, frameType, roi=None, hdr=None) :
+        if roi is None :
+            roi, hdr = self.roi(), self.hdr()
+
+        width, height, rows = frameShape(roi, hdr)
+
+        return LazyFrame.compose(dataArray, frameType, self._roiProjector(roi, hdr).rays, Camera._colorizer, width, height)
+
+    def readHdrFrame(self, count, frameType=FrameType.DISTANCE_AMPLITUDE) :
+        '''
+        Read a frame of each integration time in HDR_TEMPORAL mode and merge them, see setHdr(hdr).
+
+        Every pixel comes from a frame where it is neither saturated nor too dark, FrameType.DISTANCE_AMPLITUDE
+        gives the best merge as the pixel of highest amplitude is kept, see mergeFrames(frames). Without amplitude,
+        a pixel valid in several frames is taken from the first one read, the result then depends on the
+        integration time the sensor was at when reading started.
+
+        Parameters
+        ----------
+        count : int
+            number of frames merged, the number of integration times the sensor cycles through, as set with
+            setIntegrationTime3d(index, t).
+        frameType : FrameType
+            type of frames to read.
+
+        Returns
+        ----------
+        DecodedFrame
+            The merged frame, or None if a frame could not be read.
+        '''
+        if self.hdr() != HDR_TEMPORAL :
+            raise Exception("Temporal HDR is not enabled!")
+
+        if not isinstance(count, int) or count < 1 :
+            raise Exception("Invalid number of frames: %r" % (count,))
+
+        frames = []
+        for i in range(count) :
+            dataArray = self.readFrameRawData(frameType)
+            if not dataArray :
+                return None
+
+            decoded = self.decodeFrame(dataArray, frameType, self.roi())
+            if decoded is None :
+                return None
+
+            frames.append(decoded)
+
+        return mergeFrames(frames)
 
     def readFrame(self, frameType=FrameType.DISTANCE_GRAYSCALE) :
         '''
@@ -323,7 +862,10 @@ class Camera :
 
         FrameType.DISTANCE_AMPLITUDE: distance / depth plus amplitude
         
-        This method is an expensive call, alternatively you may use readFrameRawData and compose Frame from a separate thread in your application
+        The Frame is a LazyFrame: data_depth, data_depth_rgb, data_grayscale, data_amplitude and points_3d are only computed
+        when first accessed, an application reading only data_depth does not pay for the colors and the 3D points.
+
+        Computing all attributes is still expensive, alternatively you may use readFrameRawData and compose Frame from a separate thread in your application
         to get better frame rate.
 
         For example, for an application which the frame rate is not critical, a simple call of readFrame to get an instance of Frame object:
@@ -342,8 +884,8 @@ class Camera :
 
         Returns
         ----------
-        Frame
-            An instance of Frame.
+        LazyFrame
+            An instance of LazyFrame, compatible with Frame, or None if a bad frame was received.
 
         The members of the Frame object will be populated:
             
@@ -375,4 +917,166 @@ class Camera :
         
         dataArray = self.readFrameRawData(frameType)
 
-        return Camera.composeFrame(dataArray, frameType)
+        return self._composeLazyFrame(dataArray, frameType)
+
+    def startStream(self, frameType=FrameType.DISTANCE_GRAYSCALE) :
+        '''
+        Put the camera into stream mode.
+
+        In stream mode the camera continuously sends frames of the given frameType, so there is no request
+        round-trip for each frame. Use readStreamFrameRawData() or readStreamFrame() to get the frames,
+        and stopStream() to go back to the request mode used by readFrame(frameType).
+
+        Alternatively iterate stream(frameType), which starts and stops the stream for you:
+
+            for frame in camera.stream(FrameType.DISTANCE):
+                ...
+        '''
+        if frameType not in _FRAME_COMMANDS :
+            raise Exception("Unsupported frame type: %s" % frameType)
+
+        self._comm.startStream(_FRAME_COMMANDS[frameType])
+        self._streamFrameType = frameType
+
+    def stopStream(self) :
+        '''
+        Stop stream mode.
+        '''
+        self._comm.stopStream()
+        self._streamFrameType = None
+
+    def isStreaming(self) :
+        '''
+        get whether the camera is in stream mode, see startStream(frameType).
+        '''
+        return self._comm._streaming
+
+    def readStreamFrameRawData(self, pooled=False) :
+        '''
+        Read raw data of the next frame in stream mode, the layout of the data and pooled are the same as readFrameRawData(frameType, pooled).
+        '''
+        dataArray = self._comm.readStream(pooled=True)
+        dataArray = dataArray[TOF_635_IMAGE_HEADER_SIZE : len(dataArray)]
+
+        return dataArray if pooled else bytearray(dataArray)
+
+    def readStreamFrame(self) :
+        '''
+        Read the next Frame in stream mode.
+
+        Returns
+        ----------
+        LazyFrame
+            An instance of LazyFrame, see readFrame(frameType), or None if a bad frame was received.
+        '''
+        dataArray = self.readStreamFrameRawData()
+
+        return self._composeLazyFrame(dataArray, self._streamFrameType)
+
+    def stream(self, frameType=FrameType.DISTANCE_GRAYSCALE) :
+        '''
+        Iterate over the frames of the camera in stream mode, bad frames are skipped.
+
+        The stream is started on the first iteration and stopped once the iteration ends.
+        '''
+        self.startStream(frameType)
+        try:
+            while True:
+                frame = self.readStreamFrame()
+                if frame:
+                    yield frame
+        finally:
+            self.stopStream()
+
+    def startCapture(self, frameType=FrameType.DISTANCE_GRAYSCALE, depth=4, policy=CapturePolicy.LATEST) :
+        '''
+        Start reading raw frames with readFrameRawData(frameType) on a dedicated thread.
+
+        Frames are kept in a ring buffer of depth preallocated slots, the reader thread never waits for
+        the application, when the buffer is full the oldest frame is dropped. Get the frames with
+        readCapturedFrameRawData() or readCapturedFrame(), do not call the other read methods while capturing.
+
+        Setters, configure() and info(refresh=True) may be called while capturing, each command waits for the
+        frame being read and its reply is never mixed with a frame.
+
+        Parameters
+        ----------
+        frameType : FrameType
+            type of frames to capture.
+        depth : int
+            number of frames the ring buffer holds.
+        policy : CapturePolicy
+            CapturePolicy.LATEST to always get the most recent frame,
+            CapturePolicy.DROP_OLDEST to get all buffered frames in order.
+
+        Returns
+        ----------
+        FrameCapture
+            The running capture, its framesCaptured, framesDropped and framesFailed counters may be monitored.
+        '''
+        if self._capture is not None :
+            raise Exception("Capture is already started!")
+
+        if frameType not in _FRAME_COMMANDS :
+            raise Exception("Unsupported frame type: %s" % frameType)
+
+        slotSize = self._comm._getFrameDataSize(_FRAME_COMMANDS[frameType]) - TOF_635_IMAGE_HEADER_SIZE
+
+        def read() :
+            ## the ROI and HDR mode of the frame, a setter may change them as soon as the frame is read
+            with self._comm._lock :
+                return (self.readFrameRawData(frameType, pooled=True), self.roi(), self.hdr())
+
+        self._capture = FrameCapture(read, slotSize, depth, policy)
+        self._captureFrameType = frameType
+        self._capture.start()
+
+        return self._capture
+
+    def stopCapture(self) :
+        '''
+        Stop the capture thread started by startCapture().
+        '''
+        if self._capture is not None :
+            self._capture.stop()
+            self._capture = None
+            self._captureFrameType = None
+
+    def readCapturedFrameRawData(self, timeout=None) :
+        '''
+        Get raw data of the next captured frame, the layout of the data is the same as readFrameRawData(frameType).
+
+        Parameters
+        ----------
+        timeout : float, optional
+            seconds to wait for a frame, wait forever if not given.
+
+        Returns
+        ----------
+        bytearray
+            Raw data of the frame, or None if no frame arrived in time.
+        '''
+        if self._capture is None :
+            raise Exception("Capture is not started!")
+
+        dataArray, timestamp, roi, hdr = self._capture.get(timeout)
+        return dataArray
+
+    def readCapturedFrame(self, timeout=None) :
+        '''
+        Get the next captured Frame.
+
+        Returns
+        ----------
+        LazyFrame
+            An instance of LazyFrame, see readFrame(frameType), or None if no frame arrived in time or a bad frame was received.
+        '''
+        if self._capture is None :
+            raise Exception("Capture is not started!")
+
+        ## composed with the ROI and HDR mode the frame was read with, they may have changed since
+        dataArray, timestamp, roi, hdr = self._capture.get(timeout)
+        if dataArray is None :
+            return None
+
+        return self._composeLazyFrame(dataArray, self._captureFrameType, roi, hdr)
@@ -0,0 +1,216 @@
+import threading
+import time
+from enum import Enum
+
+from .constants import *
+
+class CapturePolicy(Enum):
+    '''
+    CapturePolicy Enum, what a consumer gets from a FrameRingBuffer.
+    '''
+    LATEST      = 0  ## the most recent frame only, older frames are dropped
+    DROP_OLDEST = 1  ## all frames in order, the oldest frame is dropped when the buffer is full
+
+class FrameRingBuffer :
+    '''
+    Bounded ring buffer of raw frames stored in preallocated fixed-size slots.
+
+    The producer never waits on consumers: when the buffer is full the oldest frame is overwritten
+    and counted as dropped.
+
+    Attributes
+    ----------
+    framesCaptured:
+        number of frames put into the buffer.
+    framesDropped:
+        number of frames overwritten or skipped before a consumer got them.
+    '''
+
+    def __init__(self, depth, slotSize, policy=CapturePolicy.LATEST) :
+        if depth < 1 :
+            raise Exception("Ring buffer depth must be at least 1!")
+
+        self._policy     = policy
+        self._slots      = [bytearray(slotSize) for i in range(depth)]
+        self._lengths    = [0] * depth
+        self._timestamps = [0.0] * depth
+        self._rois       = [None] * depth
+        self._hdrs       = [HDR_OFF] * depth
+        self._head       = 0     ## index of the next slot to write
+        self._count      = 0     ## number of frames waiting for a consumer
+        self._closed     = False
+        self._cond       = threading.Condition()
+
+        self.framesCaptured = 0
+        self.framesDropped  = 0
+
+    def __len__(self) :
+        return self._count
+
+    def put(self, dataArray, timestamp, roi=None, hdr=HDR_OFF) :
+        '''
+        copy a raw frame into the next slot.
+
+        Parameters
+        ----------
+        dataArray : bytearray
+            raw frame data.
+        timestamp : float
+            host time the frame was received.
+        roi : tuple, optional
+            ROI the frame was read with, the full sensor if not given.
+        hdr : int, optional
+            HDR mode the frame was read with.
+        '''
+        length = len(dataArray)
+        depth = len(self._slots)
+
+        with self._cond :
+            slot = self._slots[self._head]
+            if length > len(slot) :
+                slot = self._slots[self._head] = bytearray(length)
+
+            slot[0:length] = dataArray
+            self._lengths[self._head] = length
+            self._timestamps[self._head] = timestamp
+            self._rois[self._head] = roi
+            self._hdrs[self._head] = hdr
+            self._head = (self._head + 1) % depth
+
+            if self._count == depth :
+                self.framesDropped += 1
+            else :
+                self._count += 1
+
+            self.framesCaptured += 1
+            self._cond.notify()
+
+    def get(self, timeout=None) :
+        '''
+        get a copy of the next frame according to the policy of the buffer.
+
+        Parameters
+        ----------
+        timeout : float, optional
+            seconds to wait for a frame, wait forever if not given.
+
+        Returns
+        ----------
+        tuple
+            (dataArray, timestamp, roi, hdr), or (None, None, None, None) if no frame arrived in time or the buffer is closed.
+        '''
+        with self._cond :
+            if not self._cond.wait_for(lambda: self._count > 0 or self._closed, timeout) :
+                return (None, None, None, None)
+
+            if self._count == 0 :
+                return (None, None, None, None)
+
+            depth = len(self._slots)
+            if self._policy == CapturePolicy.LATEST :
+                index = (self._head - 1) % depth
+                self.framesDropped += self._count - 1
+                self._count = 0
+            else :
+                index = (self._head - self._count) % depth
+                self._count -= 1
+
+            dataArray = bytearray(self._slots[index][0:self._lengths[index]])
+            return (dataArray, self._timestamps[index], self._rois[index], self._hdrs[index])
+
+    def close(self) :
+        '''
+        wake up all consumers waiting on the buffer.
+        '''
+        with self._cond :
+            self._closed = True
+            self._cond.notify_all()
+
+class FrameCapture :
+    '''
+    Reads raw frames on a dedicated thread into a FrameRingBuffer.
+
+    Normally created by Camera.startCapture(frameType), readFunction returns (dataArray, roi, hdr) of a frame.
+
+    Attributes
+    ----------
+    framesCaptured:
+        number of frames read from the camera.
+    framesDropped:
+        number of frames dropped because consumers did not keep up.
+    framesFailed:
+        number of bad or empty reads.
+    '''
+
+    def __init__(self, readFunction, slotSize, depth=4, policy=CapturePolicy.LATEST) :
+        self._read    = readFunction
+        self._buffer  = FrameRingBuffer(depth, slotSize, policy)
+        self._running = False
+        self._thread  = None
+        self._error   = None
+
+        self.framesFailed = 0
+
+    @property
+    def framesCaptured(self) :
+        return self._buffer.framesCaptured
+
+    @property
+    def framesDropped(self) :
+        return self._buffer.framesDropped
+
+    @property
+    def running(self) :
+        return self._running
+
+    def start(self) :
+        '''
+        start the reader thread.
+        '''
+        if self._running :
+            raise Exception("Capture is already started!")
+
+        self._running = True
+        self._thread = threading.Thread(target=self._run, name='TauLidarCapture', daemon=True)
+        self._thread.start()
+
+    def stop(self) :
+        '''
+        stop the reader thread, waiting for the frame being read to complete.
+        '''
+        self._running = False
+        if self._thread is not None :
+            self._thread.join()
+            self._thread = None
+        self._buffer.close()
+
+    def get(self, timeout=None) :
+        '''
+        get the next captured frame, see FrameRingBuffer.get(timeout).
+
+        Raises
+        ----------
+        Exception
+            The reader thread stopped on an error.
+        '''
+        dataArray, timestamp, roi, hdr = self._buffer.get(timeout)
+        if dataArray is None and self._error is not None :
+            raise Exception("Capture stopped: %s" % self._error)
+
+        return (dataArray, timestamp, roi, hdr)
+
+    def _run(self) :
+        try :
+            while self._running :
+                dataArray, roi, hdr = self._read()
+                timestamp = time.time()
+
+                if not dataArray :
+                    self.framesFailed += 1
+                    continue
+
+                self._buffer.put(dataArray, timestamp, roi, hdr)
+        except Exception as e :
+            self._error = e
+            self._running = False
+            self._buffer.close()
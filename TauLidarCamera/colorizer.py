@@ -0,0 +1,168 @@
+import threading
+
+import numpy as np
+
+from TauLidarCommon.color import ColorMode
+from TauLidarCommon.d3 import ImageColorizer, NUM_COLORS
+from TauLidarCommon.frame import FrameType
+
+from .constants import *
+
+LUT_SIZE       = 0x10000   ## one entry per uint16 distance value
+LUT_CACHE_SIZE = 8         ## lookup tables kept for previously used ranges and color modes
+
+COLOR_OUT_OF_RANGE = (127, 127, 127)  ## BGR of distances outside the range
+
+## BGR of the pixel state values, the same colors used by Frame.data_depth_rgb
+_STATE_COLORS = {
+    VALUE_SATURATION:    (128, 0, 255),
+    VALUE_ADC_OVERFLOW:  (255, 14, 169),
+    VALUE_INTERFERENCE:  (255, 255, 255),
+    VALUE_EDGE_DETECTED: (0, 0, 0),
+    VALUE_LOW_AMPLITUDE: (0, 0, 0),
+}
+
+class DepthColorizer :
+    '''
+    Color depth maps with a lookup table, one uint8 BGR color per uint16 distance value.
+
+    The lookup table is computed once for a range and ColorMode, then coloring a frame is a single
+    lookup per pixel written into a caller supplied buffer:
+
+        colorizer = DepthColorizer(0, 4500)
+        image = np.empty((60, 160, 3), dtype=np.uint8)
+
+        decoded = Camera.decodeFrame(camera.readFrameRawData(FrameType.DISTANCE), FrameType.DISTANCE)
+        colorizer.colorize(decoded, out=image)
+
+    In ColorMode.DISTANCE the colors are the same as Frame.data_depth_rgb, in ColorMode.GRAYSCALE the
+    distance is mapped to a gray level over the range. Channels are in BGR order, as OpenCV expects.
+    '''
+
+    def __init__(self, start=1000, stop=4000, colorMode=ColorMode.DISTANCE) :
+        '''
+        Parameters
+        ----------
+        start : int
+            starting distance of the range in millimeters.
+        stop : int
+            stopping distance of the range in millimeters.
+        colorMode : ColorMode
+            ColorMode.DISTANCE for pseudo colors, ColorMode.GRAYSCALE for gray levels.
+        '''
+        self._lock = threading.Lock()
+        self._luts = {}
+        self._lut = None
+
+        colors = ImageColorizer().colorArray
+        self._colorArray = np.array([(c.b, c.g, c.r) for c in colors], dtype=np.uint8)
+
+        self._start = start
+        self._stop = stop
+        self._colorMode = colorMode
+
+    def setRange(self, start, stop) :
+        '''
+        set distance range for coloring.
+        '''
+        with self._lock :
+            if (start, stop) != (self._start, self._stop) :
+                self._start = start
+                self._stop = stop
+                self._lut = None
+
+    def setColorMode(self, colorMode) :
+        '''
+        set ColorMode for coloring.
+        '''
+        with self._lock :
+            if colorMode != self._colorMode :
+                self._colorMode = colorMode
+                self._lut = None
+
+    def lookupTable(self, masked=True, colorMode=None) :
+        '''
+        get the lookup table of the current range and ColorMode.
+
+        Parameters
+        ----------
+        masked : bool
+            index the table with raw distances including the confidence bits, as in FrameType.DISTANCE and
+            FrameType.DISTANCE_GRAYSCALE raw data. Without the confidence bits otherwise.
+        colorMode : ColorMode, optional
+            get the table of another ColorMode than the current one.
+
+        Returns
+        ----------
+        numpy.ndarray
+            (65536, 3) uint8 BGR colors, must not be modified.
+        '''
+        with self._lock :
+            if colorMode is not None and colorMode != self._colorMode :
+                luts = self._lookupTables((self._start, self._stop, colorMode))
+            else :
+                if self._lut is None :
+                    self._lut = self._lookupTables((self._start, self._stop, self._colorMode))
+                luts = self._lut
+
+            return luts[1] if masked else luts[0]
+
+    def _lookupTables(self, key) :
+        luts = self._luts.pop(key, None)
+        if luts is None :
+            lut = self._createLookupTable(*key)
+            luts = (lut, lut[np.arange(LUT_SIZE) & MASK_OUT_CONFIDENCE])
+
+        ## most recently used last
+        self._luts[key] = luts
+        if len(self._luts) > LUT_CACHE_SIZE :
+            del self._luts[next(iter(self._luts))]
+
+        return luts
+
+    def colorize(self, decoded, out=None) :
+        '''
+        color the distance of a decoded frame, see Camera.decodeFrame(dataArray, frameType).
+
+        Parameters
+        ----------
+        decoded : DecodedFrame
+            the decoded frame.
+        out : numpy.ndarray, optional
+            (height, width, 3) uint8 array to write into, a new array is returned if not given.
+
+        Returns
+        ----------
+        numpy.ndarray
+            (height, width, 3) uint8 BGR image.
+        '''
+        masked = decoded.frameType != FrameType.DISTANCE_AMPLITUDE
+
+        if out is None :
+            out = np.empty((decoded.height, decoded.width, 3), dtype=np.uint8)
+
+        return np.take(self.lookupTable(masked), decoded.distance, axis=0, out=out)
+
+    def _createLookupTable(self, start, stop, colorMode) :
+        start = float(start)
+        stop = float(stop)
+
+        values = np.arange(LUT_SIZE, dtype=np.float64)
+        lut = np.empty((LUT_SIZE, 3), dtype=np.uint8)
+
+        if colorMode == ColorMode.GRAYSCALE :
+            gray = np.clip(values * (255.0 / (stop - start)), 0, 255).astype(np.uint8)
+            lut[:] = gray[:, None]
+        else :
+            ## same arithmetic as ImageColorizer.getColor(distance)
+            offset = values - start
+            index = NUM_COLORS - ((offset * (NUM_COLORS / (stop - start))).astype(np.int64) - 1) - 1
+            lut[:] = self._colorArray[np.clip(index, 0, NUM_COLORS - 1)]
+
+            lut[(offset < 0) | (offset > stop)] = COLOR_OUT_OF_RANGE
+            lut[0] = self._colorArray[0]
+
+        for value, color in _STATE_COLORS.items() :
+            lut[value] = color
+
+        return lut
@@ -1,12 +1,25 @@
 import serial
 import serial.tools.list_ports
-from time import sleep
+from time import sleep, monotonic
+from concurrent.futures import ThreadPoolExecutor
 import binascii
+import threading
 
 from .constants import *
 from .crc import *
 from .util import *
 
+## bytes of each pixel in the data of an acquisition command
+_BYTES_PER_PIXEL = {
+    COMMAND_GET_DISTANCE:               2,  ## 16 bit distance
+    COMMAND_GET_DISTANCE_GRAYSCALE:     3,  ## 16 bit distance + 8 bit grayscale
+    COMMAND_GET_DISTANCE_AMPLITUDE:     4,  ## 16 bit distance + 16 bit amplitude
+    COMMAND_GET_AMPLITUDE:              2,  ## 16 bit amplitude
+    COMMAND_GET_GRAYSCALE:              1,  ## 8 bit grayscale
+    COMMAND_GET_DCS:                    8,  ## 4 x 16 bit DCS
+    COMMAND_GET_DCS_DISTANCE_AMPLITUDE: 12, ## 4 x 16 bit DCS + 16 bit distance + 16 bit amplitude
+}
+
 class Communication:
     '''
     Communication to the ToF sensor via serial port.
@@ -15,45 +28,134 @@ class Communication:
     def __init__(self):
         self._ser = serial.Serial()
         self._ser.baudrate = 4000000
-        self._ser.timeout = 0.001
+        self._ser.timeout = 0.05
         self._ser.parity = serial.PARITY_NONE
         self._ser.stopbits = serial.STOPBITS_ONE
         self._ser.bytesize = serial.EIGHTBITS
 
+        self._readTimeout = 1.0
+        self._verifyChecksum = True
+
+        self._packets = {}
+        self._acquisitionPackets = {}
+
+        ## last values acknowledged by the sensor, by parameter
+        self._parameters = {}
+
+        ## setup commands queued between beginBatch() and endBatch()
+        self._batch = None
+        self._rxBuffer = bytearray(COMMAND_SIZE_OVERHEAD)
+
+        self._streaming = False
+        self._streamSize = 0
+
+        ## one command and its reply at a time, a capture thread, camera group or pipeline may read frames
+        ## while another thread sends setup commands
+        self._lock = threading.RLock()
+
+        ## full frame until setRoi() is called
+        self._xMin = 0
+        self._yMin = 0
+        self._xMax = 159
+        self._yMax = 59
+        self._hdr = HDR_OFF
+
+
+    def scan(self, timeout=SCAN_TIMEOUT, usbIds=None):
+        '''
+        scan for serial ports connected to Tau LiDAR cameras, all candidate ports are probed in parallel.
 
-    def scan(self):
-        deviceList = []
+        Parameters
+        ----------
+        timeout: float
+            time to wait for the identification of each port.
+        usbIds: list, optional
+            (vid, pid) tuples of the USB devices to probe, when none is connected the ports without USB
+            information are probed. By default all serial ports are probed.
+
+        Returns
+        ----------
+        list
+            serial port device names.
+        '''
         print('Looking for connected Tau LiDAR Camera hardware ...')
 
-        ports = list(serial.tools.list_ports.comports())
-        for port, description, address in ports:
-            self._ser.port = port
-            try:
-                self._ser.open()
-            except:
-                pass
-            if self._ser.is_open:
-                try:
-                    ## Verify if it is valid device
-                    dataArray = self.getIdentification()
-                    identificationValue = int(binascii.hexlify(dataArray), 16)
-                    chipType = (identificationValue & MASK_CHIP_TYPE_DEVICE) >> SHIFT_CHIP_TYPE_DEVICE
-                    chipVersion = (identificationValue & MASK_VERSION) >> SHIFT_VERSION
-
-                    nChipType = int(chipType)
-                    nChipVersion = int(chipVersion)
-
-                    if (nChipType >= 4 and nChipVersion >= 0):
-                        deviceList.append(port)
-                except:
-                    pass
-                self._ser.close()
+        deviceList = Communication._discover(lambda comm: comm._ser.port if comm._isTauDevice() else None, timeout, usbIds)
 
         if len(deviceList) == 0:
             print("No Tau Camera devices found, please check: \n1. If Tau Camera is connected; \n2. If current user has permission to access all serial ports.")
 
         return deviceList
 
+    @staticmethod
+    def _candidatePorts(usbIds=None):
+
+        ports = list(serial.tools.list_ports.comports())
+
+        if usbIds is None :
+            return [port.device for port in ports]
+
+        matching = [port.device for port in ports if (port.vid, port.pid) in usbIds]
+        if len(matching) > 0 :
+            return matching
+
+        ## pyserial does not report the USB ids of every adapter, a camera may be one of the ports without them
+        return [port.device for port in ports if port.vid is None]
+
+    @staticmethod
+    def _discover(probe, timeout=SCAN_TIMEOUT, usbIds=None):
+        '''
+        open every candidate port with its own Communication in parallel and call probe(communication) on it.
+
+        Returns
+        ----------
+        list
+            results of probe which are not None, in port order.
+        '''
+        ports = Communication._candidatePorts(usbIds)
+        if len(ports) == 0 :
+            return []
+
+        def run(port) :
+            comm = Communication()
+            comm.setTimeout(timeout)
+            comm._ser.write_timeout = timeout
+            comm._ser.port = port
+            try:
+                comm._ser.open()
+            except:
+                return None
+
+            try:
+                return probe(comm)
+            except:
+                return None
+            finally:
+                comm.close()
+
+        with ThreadPoolExecutor(max_workers=len(ports)) as executor :
+            results = list(executor.map(run, ports))
+
+        return [result for result in results if result is not None]
+
+    def _isTauDevice(self):
+        '''
+        verify if the device at the opened serial port is a Tau camera.
+        '''
+        try:
+            dataArray = self.getIdentification()
+            identificationValue = int(binascii.hexlify(dataArray), 16)
+        except:
+            return False
+
+        chipType = (identificationValue & MASK_CHIP_TYPE_DEVICE) >> SHIFT_CHIP_TYPE_DEVICE
+        chipVersion = (identificationValue & MASK_VERSION) >> SHIFT_VERSION
+
+        nChipType = int(chipType)
+        nChipVersion = int(chipVersion)
+
+        return (nChipType >= 4 and nChipVersion >= 0)
+
     def open(self, port):
         '''
         auto detect sensor at serial port and open communication to the sensor if port is not given,
@@ -69,69 +171,116 @@ class Communication:
 
         message = ""
         if port is None:
-            print('Looking for connected Tau LiDAR Camera hardware ...')
-            ports = list(serial.tools.list_ports.comports())
-            connected = False
-            for port_no, description, address in ports:
-                try:
-                    self._ser.port = port_no
-                    self._ser.open()
-
-                    ## Verify if it is valid device
-                    dataArray = self.getIdentification()
-                    identificationValue = int(binascii.hexlify(dataArray), 16)
-                    chipType = (identificationValue & MASK_CHIP_TYPE_DEVICE) >> SHIFT_CHIP_TYPE_DEVICE
-                    chipVersion = (identificationValue & MASK_VERSION) >> SHIFT_VERSION
-
-                    nChipType = int(chipType)
-                    nChipVersion = int(chipVersion)
-
-                    if (nChipType >= 4 and nChipVersion >= 0):
-                        connected = True
-                        break
-                except:
-                    self._ser.close()
-
-            if not connected:
+            ports = self.scan()
+
+            if len(ports) == 0:
                 message = "No Tau Camera found, please check: \n1. If Tau Camera is connected; \n2. If current user has permission to access all serial ports."
                 raise Exception(message)
-        else:
-            self._ser.port = port
-            try:
-                self._ser.open()
-            except:
-                message = "Failed connecting to the serial port %s, please check: \n1. If Tau Camera is connected; \n2. If current user has permission to access the port" % port
-                raise Exception(message)
+
+            port = ports[0]
+
+        self._ser.port = port
+        try:
+            self._ser.open()
+        except:
+            message = "Failed connecting to the serial port %s, please check: \n1. If Tau Camera is connected; \n2. If current user has permission to access the port" % port
+            raise Exception(message)
+
+        self._parameters.clear()
+        self._precomputePackets()
 
         return self
 
+    def setTimeout(self, timeout):
+        '''
+        set the maximum time to wait for a complete reply from the sensor.
+
+        Parameters
+        ----------
+        timeout: float
+            timeout in seconds, default 1.0.
+        '''
+        self._readTimeout = timeout
+
+    def setChecksumVerification(self, enabled):
+        '''
+        turn on or off verifying the checksum of the data received from the sensor, it is on by default.
+
+        Parameters
+        ----------
+        enabled: bool
+            verify the checksum if True.
+        '''
+        self._verifyChecksum = enabled
+
     def close(self):
         '''
         close communication to the sensor.
         '''
         if self._ser.is_open :
+            self.stopStream()
             self._ser.close()
 
+        self._parameters.clear()
+
+    def _getPacket(self, data):
+        '''
+        get the finished packet, with start mark and checksum, of a command.
+        Packets are cached by command and payload, so each one is only built and checksummed once.
+        '''
+        key = (data[COMMAND_INDEX_COMMAND], bytes(data[COMMAND_INDEX_DATA:]))
+
+        packet = self._packets.get(key)
+        if packet is None :
+            data[0] = COMMAND_START_MARK
+            checksum = calculateChecksum(data, (COMMAND_SIZE_TOTAL - 4))
+
+            setUint32LittleEndian(data, (COMMAND_SIZE_TOTAL - 4), checksum)
+
+            if len(self._packets) >= PACKET_CACHE_SIZE :
+                self._packets.clear()
+                self._precomputePackets()
+
+            packet = self._packets[key] = bytes(data)
+
+        return packet
+
+    def _precomputePackets(self):
+
+        for command in _BYTES_PER_PIXEL :
+            for mode in (AUTO_REPEAT, STREAM) :
+                data = bytearray(COMMAND_SIZE_TOTAL)
+                data[COMMAND_INDEX_COMMAND] = command
+                data[COMMAND_INDEX_DATA] = mode
+                self._acquisitionPackets[(command, mode)] = self._getPacket(data)
+
     def _write(self, data):
 
         if not self._ser.is_open :
             print("ERROR: serial port is not open!")
             return
 
-        data[0] = COMMAND_START_MARK
-        checksum = calculateChecksum(data, (COMMAND_SIZE_TOTAL - 4))
-
-        setUint32LittleEndian(data, (COMMAND_SIZE_TOTAL - 4), checksum)
+        packet = self._getPacket(data)
 
         ################################
         ##debeg_str= "SEND COMMAND: "
         ##for i in range(14) :
-        ##    buf = "%x" % data[i]
+        ##    buf = "%x" % packet[i]
         ##    debeg_str += buf
         ##print(debeg_str)
         ################################
 
-        return self._ser.write(data)
+        return self._ser.write(packet)
+
+    def _readInto(self, view, deadline):
+
+        received = 0
+        while received < len(view) :
+            received += self._ser.readinto(view[received:])
+
+            if received < len(view) and monotonic() > deadline : break
+
+        return received
 
     def _read(self, size):
 
@@ -139,25 +288,61 @@ class Communication:
             print("ERROR: serial port is not open!")
             return
 
-        size_with_command = size + 8
+        deadline = monotonic() + self._readTimeout
+        reply = self._receive(size)
+
+        try:
+            view = next(reply)
+            while True :
+                view = reply.send(self._readInto(view, deadline))
+        except StopIteration as result :
+            return result.value
+
+    def _receive(self, size):
+        '''
+        parse a reply into the receive buffer, the bytes are read by the caller.
+
+        A generator: it yields the memoryview to fill next and is sent the number of bytes read into it,
+        it returns the result of _processData(array, size). _read(size) drives it with blocking reads,
+        AsyncCamera with non-blocking ones.
+
+        Pooled frames stay valid while setup commands are sent from another thread, see Camera.startCapture():
+        their replies carry at most a few bytes of data and only overwrite the start of the buffer, the frame
+        data begins after COMMAND_SIZE_HEADER + TOF_635_IMAGE_HEADER_SIZE bytes.
+        '''
+        buffer = self._rxBuffer
+        view = memoryview(buffer)
+
+        ## Read the header first, it tells the exact size of the rest of the data
+        received = yield view[0:COMMAND_SIZE_HEADER]
+
+        if received == COMMAND_SIZE_HEADER and buffer[0] == DATA_START_MARK :
+            total = COMMAND_SIZE_OVERHEAD + self._getReplySize(buffer, size)
 
-        array = bytearray(0)
-        count = 0
-        while (len(array) < size_with_command) :
-            len_pending = size_with_command - len(array)
-            in_waiting = self._ser.in_waiting
-            sz = max(len_pending, self._ser.in_waiting)
-            
-            buf = self._ser.read(sz)
-            a = bytearray(buf)
-            array.extend(a)
+            if total > len(buffer) :
+                ## Grow the receive buffer once, it is reused for the following reads
+                view.release()
+                header = buffer[0:COMMAND_SIZE_HEADER]
+                buffer = self._rxBuffer = bytearray(total)
+                buffer[0:COMMAND_SIZE_HEADER] = header
+                view = memoryview(buffer)
 
-            count += 1
-            if count > 100 : break
+            received += yield view[COMMAND_SIZE_HEADER:total]
+        elif received > 0 :
+            ## Out of sync with the sensor, drop whatever is pending
+            self._ser.reset_input_buffer()
 
-        return self._processData(array, size)
+        view.release()
+
+        return self._processData(memoryview(buffer)[0:received], size)
 
     def _processData(self, array, size):
+        '''
+        validate a reply and locate its payload.
+
+        The payload is returned as a memoryview into array, without copying, it is only valid
+        until array is reused for the next reply.
+        '''
 
         data_length = len(array)
 
@@ -184,18 +369,17 @@ class Communication:
             return (-1, bytearray(0))
 
         ## Get the expexted size
-        expectedSize = self._getExpextedSize(array)
+        expectedSize = self._getReplySize(array, size)
 
-        #if checksumIsCorrect(array, expectedSize) : ## calculate checksum for a frame data size 28880 is too time consumming, turn off checking for now
-        type = self._getType(array)
-        dataArray = array
-        dataArray[0:COMMAND_SIZE_HEADER] = []
+        ## Drop corrupted data, a short reply is reported below
+        if self._verifyChecksum and data_length >= COMMAND_SIZE_OVERHEAD + expectedSize :
+            if not checksumIsCorrect(array, expectedSize) :
+                return (-1, bytearray(0))
 
-        ## Remove checksum at the end
-        dataArray[expectedSize:expectedSize + COMMAND_SIZE_CHECKSUM] = []
+        type = self._getType(array)
 
-        ## Remove the rest at the end
-        dataArray[expectedSize:len(dataArray)] = []
+        ## Payload without the header, the checksum and the rest at the end
+        dataArray = memoryview(array)[COMMAND_SIZE_HEADER : min(COMMAND_SIZE_HEADER + expectedSize, data_length)]
 
         data_length = len(dataArray)
 
@@ -204,20 +388,52 @@ class Communication:
 
         return (type, dataArray)
 
+    def _checkNotStreaming(self):
+        ## a reply would be mixed with the streamed frames
+        if self._streaming :
+            raise Exception("Sensor is streaming, stop the stream first!")
+
     def _sendCommand(self, data, size):
 
-        if self._write(data) > 0:
-            return self._read(size)
+        with self._lock :
+            self._checkNotStreaming()
+
+            if self._write(data) > 0:
+                return self._read(size)
+
+        return None
+
+    def _sendAcquisitionCommand(self, command, mode, size):
+
+        packet = self._acquisitionPackets.get((command, mode))
+        if packet is None :
+            return self._sendCommandSingleByte(command, mode, size)
+
+        if not self._ser.is_open :
+            print("ERROR: serial port is not open!")
+            return None
+
+        with self._lock :
+            self._checkNotStreaming()
+
+            if self._ser.write(packet) > 0:
+                return self._read(size)
 
         return None
 
     def _sendCommandWithoutData(self, command, size):
+        return self._sendCommand(self._commandWithoutData(command), size)
+
+    def _commandWithoutData(self, command):
 
         data = bytearray(14)
         data[1] = command
-        return self._sendCommand(data, size)
+        return data
 
     def _sendCommandSingleByte(self, command, payload, size):
+        return self._sendCommand(self._commandSingleByte(command, payload), size)
+
+    def _commandSingleByte(self, command, payload):
         data = bytearray(COMMAND_SIZE_TOTAL)
 
         ## Add the command
@@ -226,9 +442,9 @@ class Communication:
         ## Add the single byte at the first position
         data[COMMAND_INDEX_DATA] = payload
 
-        return self._sendCommand(data, size)
+        return data
 
-    def _sendCommand2xByte(self, command, payload0, payload1, type):
+    def _command2xByte(self, command, payload0, payload1):
         data = bytearray(COMMAND_SIZE_TOTAL)
 
         ## Add the command
@@ -240,9 +456,9 @@ class Communication:
         ## Add the second byte
         data[COMMAND_INDEX_DATA + 1] = payload1
 
-        return self._sendCommand(data, type)
+        return data
 
-    def _sendCommandUint16(self, command, payload, size):
+    def _commandUint16(self, command, payload):
         data = bytearray(COMMAND_SIZE_TOTAL)
 
         ## Add the command
@@ -251,9 +467,9 @@ class Communication:
         ## Add the payload
         setUint16LittleEndian(data, COMMAND_INDEX_DATA, payload)
 
-        return self._sendCommand(data, size)
+        return data
 
-    def _sendCommandInt16(self, command, payload, size):
+    def _commandInt16(self, command, payload):
         data = bytearray(COMMAND_SIZE_TOTAL)
 
         ## Add the command
@@ -262,15 +478,107 @@ class Communication:
         ## Add the payload
         setInt16LittleEndian(data, COMMAND_INDEX_DATA, payload)
 
-        return self._sendCommand(data, size)
+        return data
+
+    def _setParameter(self, key, value, data, force):
+        '''
+        send a setup command unless the sensor already acknowledged the same value for this parameter.
+        '''
+        if not force and key in self._parameters and self._parameters[key] == value :
+            return (DATA_ACK, bytearray(0))
+
+        if self._batch is not None :
+            self._batch.append((key, value, self._getPacket(data)))
+            return None
+
+        result = self._sendCommand(data, 0) ## expected data length: 0
+
+        self._updateParameter(key, value, result[0] if result is not None else -1)
+
+        return result
+
+    def _updateParameter(self, key, value, type):
+
+        if type == DATA_ACK :
+            self._parameters[key] = value
+
+            if key == 'roi' :
+                self._xMin, self._yMin, self._xMax, self._yMax = value
+            elif key == 'hdr' :
+                self._hdr = value
+        else :
+            self._parameters.pop(key, None)
 
     def _getExpextedSize(self, array):
         return getUint16LittleEndian(array, DATA_INDEX_LENGTH)
 
+    def _getReplySize(self, array, size):
+        expectedSize = self._getExpextedSize(array)
+
+        ## the length is 16 bit, replies of 64 kB or more, such as DCS frames of the whole sensor, only send its low bits
+        if size > 0xFFFF and (size & 0xFFFF) == expectedSize :
+            return size
+
+        return expectedSize
+
     def _getType(self, array) :
         return array[DATA_INDEX_TYPE]
 
-    def setModulationFrequency(self, frequency):
+    def beginBatch(self):
+        '''
+        start queuing setup commands instead of sending them one by one, until endBatch() is called.
+        '''
+        if self._batch is not None :
+            raise Exception("Batch is already started!")
+
+        self._batch = []
+
+    def cancelBatch(self):
+        '''
+        discard the setup commands queued since beginBatch().
+        '''
+        self._batch = None
+
+    def _takeBatch(self):
+
+        batch = self._batch
+        self._batch = None
+
+        return batch
+
+    def endBatch(self):
+        '''
+        send all setup commands queued since beginBatch() back to back, then collect the replies in order.
+
+        Returns
+        ----------
+        list
+            (parameter, type) of each command sent, type is DATA_ACK if the sensor acknowledged the value.
+        '''
+        batch = self._takeBatch()
+        if not batch :
+            return []
+
+        if not self._ser.is_open :
+            print("ERROR: serial port is not open!")
+            return [(key, -1) for key, value, packet in batch]
+
+        results = []
+
+        with self._lock :
+            self._checkNotStreaming()
+
+            self._ser.write(b''.join(packet for key, value, packet in batch))
+
+            for key, value, packet in batch :
+                type, data = self._read(0)
+
+                self._updateParameter(key, value, type)
+                results.append((key, type))
+
+        return results
+
+    def setModulationFrequency(self, frequency, force=False):
         '''
         set Modulation Frequency.
 
@@ -278,10 +586,12 @@ class Communication:
         ----------
         frequency
             VALUE_10MHZ (10mHz) or VALUE_20MHZ (20mHz).
+        force
+            send the command even if the sensor already has this value.
         '''
-        return self._sendCommandSingleByte(COMMAND_SET_MODULATION_FREQUENCY, frequency, 0) ## expected data length: 0
+        return self._setParameter('modulationFrequency', frequency, self._commandSingleByte(COMMAND_SET_MODULATION_FREQUENCY, frequency), force)
 
-    def setModulationChannel(self, autoChannelEnabled, channel):
+    def setModulationChannel(self, autoChannelEnabled, channel, force=False):
         '''
         set Modulation Channel.
 
@@ -291,10 +601,12 @@ class Communication:
             on or off the auto Channel
         channel
             0 - 10.
+        force
+            send the command even if the sensor already has this value.
         '''
-        return self._sendCommand2xByte(COMMAND_SET_MODULATION_CHANNEL, autoChannelEnabled, channel, DATA_ACK)
+        return self._setParameter('modulationChannel', (autoChannelEnabled, channel), self._command2xByte(COMMAND_SET_MODULATION_CHANNEL, autoChannelEnabled, channel), force)
 
-    def setMode(self, mode):
+    def setMode(self, mode, force=False):
         '''
         set Mode.
 
@@ -302,10 +614,12 @@ class Communication:
         ----------
         mode
             0 - wide FOV
+        force
+            send the command even if the sensor already has this value.
         '''
-        return self._sendCommandSingleByte(COMMAND_SET_MODE, mode, 0) ## expected data length: 0
+        return self._setParameter('mode', mode, self._commandSingleByte(COMMAND_SET_MODE, mode), force)
 
-    def setHdr(self, hdr):
+    def setHdr(self, hdr, force=False):
         '''
         set HDR.
 
@@ -313,23 +627,27 @@ class Communication:
         ----------
         hdr
             0 - HDR Off
+            1 - Spatial HDR
+            2 - Temporal HDR
+        force
+            send the command even if the sensor already has this value.
         '''
-        self._hdr = hdr
-
-        return self._sendCommandSingleByte(COMMAND_SET_HDR,  hdr, 0)  ## expected data length: 0
+        return self._setParameter('hdr', hdr, self._commandSingleByte(COMMAND_SET_HDR, hdr), force)
 
-    def setIntegrationTimeGrayscale(self, integrationTime):
+    def setIntegrationTimeGrayscale(self, integrationTime, force=False):
         '''
         set Integration Time Grayscale.
 
         Parameters
         ----------
         integrationTime
-            0 - 50000
+            0 - VALUE_INTEGRATION_TIME_GRAYSCALE_MAX (25000)
+        force
+            send the command even if the sensor already has this value.
         '''
-        return self._sendCommandUint16(COMMAND_SET_INTEGRATION_TIME_GRAYSCALE, integrationTime, 0)
+        return self._setParameter('integrationTimeGrayscale', integrationTime, self._commandUint16(COMMAND_SET_INTEGRATION_TIME_GRAYSCALE, integrationTime), force)
 
-    def setOffset(self, offset):
+    def setOffset(self, offset, force=False):
         '''
         set Offset.
 
@@ -337,10 +655,12 @@ class Communication:
         ----------
         offset
             distance offset
+        force
+            send the command even if the sensor already has this value.
         '''
-        return self._sendCommandInt16(COMMAND_SET_OFFSET, offset, 0)  ## expected data length: 0
+        return self._setParameter('offset', offset, self._commandInt16(COMMAND_SET_OFFSET, offset), force)
 
-    def setIntegrationTime3d(self, index, integrationTime):
+    def setIntegrationTime3d(self, index, integrationTime, force=False):
         '''
         set set Integration Time 3d.
 
@@ -350,6 +670,8 @@ class Communication:
             integrationTime index
         integrationTime
             integrationTime
+        force
+            send the command even if the sensor already has this value.
         '''
         data = bytearray(COMMAND_SIZE_TOTAL)
 
@@ -362,9 +684,9 @@ class Communication:
         ## Add the time
         setUint16LittleEndian(data, INDEX_INTEGRATION_TIME_3D, integrationTime)
 
-        return self._sendCommand(data, 0)
+        return self._setParameter(('integrationTime3d', index), integrationTime, data, force)
 
-    def setMinimalAmplitude(self, index, amplitude):
+    def setMinimalAmplitude(self, index, amplitude, force=False):
         '''
         set Minimal Amplitude.
 
@@ -374,6 +696,8 @@ class Communication:
             MinimalAmplitude index
         amplitude
             amplitude
+        force
+            send the command even if the sensor already has this value.
         '''
         data = bytearray(COMMAND_SIZE_TOTAL)
 
@@ -386,9 +710,9 @@ class Communication:
         ## Add the amplitude
         setUint16LittleEndian(data, INDEX_AMPLITUDE, amplitude)
 
-        return self._sendCommand(data, 0)
+        return self._setParameter(('minimalAmplitude', index), amplitude, data, force)
 
-    def setRoi(self, xMin, yMin, xMax, yMax):
+    def setRoi(self, xMin, yMin, xMax, yMax, force=False):
         '''
         set Roi.
 
@@ -402,6 +726,8 @@ class Communication:
             xMax
         yMax
             yMax
+        force
+            send the command even if the sensor already has this value.
         '''
         data = bytearray(COMMAND_SIZE_TOTAL + 4 * 2) ## 4 two-bytes data (uint16_t in c++)
 
@@ -420,69 +746,320 @@ class Communication:
         ## yMax
         setUint16LittleEndian(data, INDEX_ROI_Y_MAX, yMax)
 
-        self._xMin = xMin
-        self._yMin = yMin
-        self._xMax = xMax
-        self._yMax = yMax
+        ## the frame size follows the ROI once the sensor acknowledged it, see _updateParameter()
+        return self._setParameter('roi', (xMin, yMin, xMax, yMax), data, force)
+
+    def setTemporalFilter(self, factor, threshold, edgeThreshold, force=False):
+        '''
+        set Temporal Filter and edge detection.
+
+        Parameters
+        ----------
+        factor
+            weight of the new frame 0 - 1000 for 0.0 - 1.0, 0 disables the filter
+        threshold
+            distance change in millimeters above which the new frame is taken as is
+        edgeThreshold
+            edge detection threshold, 0 disables the edge detection
+        force
+            send the command even if the sensor already has this value.
+        '''
+        data = bytearray(COMMAND_SIZE_TOTAL)
+
+        ## Add the command
+        data[COMMAND_INDEX_COMMAND] = COMMAND_SET_FILTER
+
+        setUint16LittleEndian(data, INDEX_TEMPORAL_FILTER_FACTOR, factor)
+        setUint16LittleEndian(data, INDEX_TEMPORAL_FILTER_THRESHOLD, threshold)
+        setUint16LittleEndian(data, INDEX_EDGE_DETECTION_THRESHOLD, edgeThreshold)
+
+        return self._setParameter('temporalFilter', (factor, threshold, edgeThreshold), data, force)
+
+    def setSingleSpotFilter(self, factor, threshold, force=False):
+        '''
+        set Temporal Filter of the single spot.
+
+        Parameters
+        ----------
+        factor
+            weight of the new frame 0 - 1000 for 0.0 - 1.0, 0 disables the filter
+        threshold
+            distance change in millimeters above which the new frame is taken as is
+        force
+            send the command even if the sensor already has this value.
+        '''
+        data = bytearray(COMMAND_SIZE_TOTAL)
+
+        ## Add the command
+        data[COMMAND_INDEX_COMMAND] = COMMAND_SET_FILTER_SINGLE_SPOT
+
+        setUint16LittleEndian(data, INDEX_TEMPORAL_FILTER_FACTOR, factor)
+        setUint16LittleEndian(data, INDEX_TEMPORAL_FILTER_THRESHOLD, threshold)
+
+        return self._setParameter('singleSpotFilter', (factor, threshold), data, force)
+
+    def setGaussianFilter(self, enabled, force=False):
+        '''
+        set Gaussian Filter.
+
+        Parameters
+        ----------
+        enabled
+            on or off the filter
+        force
+            send the command even if the sensor already has this value.
+        '''
+        return self._setParameter('gaussianFilter', bool(enabled), self._commandSingleByte(COMMAND_SET_GAUSSIAN_FILTER, int(enabled)), force)
+
+    def setDcsFilter(self, enabled, force=False):
+        '''
+        set DCS Filter.
+
+        Parameters
+        ----------
+        enabled
+            on or off the filter
+        force
+            send the command even if the sensor already has this value.
+        '''
+        return self._setParameter('dcsFilter', bool(enabled), self._commandSingleByte(COMMAND_SET_DCS_FILTER, int(enabled)), force)
+
+    def setFrameRate(self, frameRate, force=False):
+        '''
+        set Frame Rate limit.
 
-        return self._sendCommand(data, 0)
+        Parameters
+        ----------
+        frameRate
+            maximum frames per second, 0 for no limit
+        force
+            send the command even if the sensor already has this value.
+        '''
+        return self._setParameter('frameRate', frameRate, self._commandUint16(COMMAND_SET_FRAME_RATE, frameRate), force)
 
     def getChipInformation(self):
         '''
         get Chip Information.
         '''
         type, data = self._sendCommandWithoutData(COMMAND_GET_CHIP_INFORMATION, CHIP_INFORMATION_DATA_SIZE)
-        return data
+        return bytearray(data)
 
     def getIdentification(self):
         '''
         get getIdentification.
         '''
         type, data = self._sendCommandWithoutData(COMMAND_GET_IDENTIFICATION, IDENTIFICATION_DATA_SIZE)
-        return data
+        return bytearray(data)
 
     def getFirmwareRelease(self):
         '''
         get Firmware Release.
         '''
         type, data = self._sendCommandWithoutData(COMMAND_GET_FIRMWARE_RELEASE, FIRMWARE_RELEASE_DATA_SIZE)
-        return data
+        return bytearray(data)
 
-    def getDistanceGrayscale(self):
+    def getIntegrationTime3d(self):
         '''
-        get Distance Grayscale image.
+        get Integration Time 3d used by the sensor.
         '''
-        dataSize = 0
+        type, data = self._sendCommandWithoutData(COMMAND_GET_INTEGRATION_TIME_3D, INTEGRATION_TIME_DATA_SIZE)
+        return bytearray(data)
 
-        if self._hdr == HDR_SPATIAL : dataSize = 3 * (self._xMax - self._xMin + 1) * (self._yMax - self._yMin + 1) / 2 + 80 ## 16 bit distance/2 + 8 bit grayscale/2
+    def _getFrameDataSize(self, command):
+        '''
+        get expected data size of an acquisition command, image header included.
+
+        Parameters
+        ----------
+        command
+            COMMAND_GET_DISTANCE, COMMAND_GET_DISTANCE_GRAYSCALE, COMMAND_GET_DISTANCE_AMPLITUDE, COMMAND_GET_AMPLITUDE,
+            COMMAND_GET_GRAYSCALE, COMMAND_GET_DCS or COMMAND_GET_DCS_DISTANCE_AMPLITUDE
+        '''
+        bytesPerPixel = _BYTES_PER_PIXEL[command]
+
+        pixels = (self._xMax - self._xMin + 1) * (self._yMax - self._yMin + 1)
+
+        ## spatial HDR merges each pair of rows
+        if self._hdr == HDR_SPATIAL :
+            dataSize = bytesPerPixel * pixels // 2 + TOF_635_IMAGE_HEADER_SIZE
         else :
-            dataSize = 3 * (self._xMax - self._xMin + 1) * (self._yMax - self._yMin + 1) + 80 ## 16 bit distance + 8 bit grayscale;
+            dataSize = bytesPerPixel * pixels + TOF_635_IMAGE_HEADER_SIZE
 
-        type, data = self._sendCommandSingleByte(COMMAND_GET_DISTANCE_GRAYSCALE, AUTO_REPEAT, dataSize)
-        return data
+        return dataSize
 
-    def getDistanceAmplitude(self):
+    def getDistanceGrayscale(self, pooled=False):
         '''
-        get Distance Amplitude image.
+        get Distance Grayscale image.
+
+        Parameters
+        ----------
+        pooled : bool
+            if True, return a memoryview into the receive buffer instead of a copy, it is only valid
+            until the next read from the sensor.
         '''
-        dataSize = 0
+        dataSize = self._getFrameDataSize(COMMAND_GET_DISTANCE_GRAYSCALE)
 
-        if self._hdr == HDR_SPATIAL : dataSize = 2 * (self._xMax - self._xMin + 1) * (self._yMax - self._yMin + 1) + 80 ## 16 bit distance/2 + 16 bit
-        else :
-            dataSize = 4 * (self._xMax - self._xMin + 1) * (self._yMax - self._yMin + 1) + 80 ## 16 bit distance + 16 bit amplitude
+        type, data = self._sendAcquisitionCommand(COMMAND_GET_DISTANCE_GRAYSCALE, AUTO_REPEAT, dataSize)
+        return data if pooled else bytearray(data)
 
-        type, data = self._sendCommandSingleByte(COMMAND_GET_DISTANCE_AMPLITUDE, AUTO_REPEAT, dataSize)
-        return data
+    def getDistanceAmplitude(self, pooled=False):
+        '''
+        get Distance Amplitude image.
+
+        Parameters
+        ----------
+        pooled : bool
+            if True, return a memoryview into the receive buffer instead of a copy, it is only valid
+            until the next read from the sensor.
+        '''
+        dataSize = self._getFrameDataSize(COMMAND_GET_DISTANCE_AMPLITUDE)
 
-    def getDistance(self):
+        type, data = self._sendAcquisitionCommand(COMMAND_GET_DISTANCE_AMPLITUDE, AUTO_REPEAT, dataSize)
+        return data if pooled else bytearray(data)
+
+    def getDistance(self, pooled=False):
         '''
         get Distance only.
+
+        Parameters
+        ----------
+        pooled : bool
+            if True, return a memoryview into the receive buffer instead of a copy, it is only valid
+            until the next read from the sensor.
         '''
-        dataSize = 0
+        dataSize = self._getFrameDataSize(COMMAND_GET_DISTANCE)
 
-        if self._hdr == HDR_SPATIAL : dataSize = (self._xMax - self._xMin + 1) * (self._yMax - self._yMin + 1) + 80 ## 16 bit distance
-        else :
-            dataSize = 2 * (self._xMax - self._xMin + 1) * (self._yMax - self._yMin + 1) + 80 ## 16 bit distance
+        type, data = self._sendAcquisitionCommand(COMMAND_GET_DISTANCE, AUTO_REPEAT, dataSize)
+        return data if pooled else bytearray(data)
 
-        type, data = self._sendCommandSingleByte(COMMAND_GET_DISTANCE, AUTO_REPEAT, dataSize)
-        return data
+    def getAmplitude(self, pooled=False):
+        '''
+        get Amplitude only.
+
+        Parameters
+        ----------
+        pooled : bool
+            if True, return a memoryview into the receive buffer instead of a copy, it is only valid
+            until the next read from the sensor.
+        '''
+        dataSize = self._getFrameDataSize(COMMAND_GET_AMPLITUDE)
+
+        type, data = self._sendAcquisitionCommand(COMMAND_GET_AMPLITUDE, AUTO_REPEAT, dataSize)
+        return data if pooled else bytearray(data)
+
+    def getGrayscale(self, pooled=False):
+        '''
+        get Grayscale only.
+
+        Parameters
+        ----------
+        pooled : bool
+            if True, return a memoryview into the receive buffer instead of a copy, it is only valid
+            until the next read from the sensor.
+        '''
+        dataSize = self._getFrameDataSize(COMMAND_GET_GRAYSCALE)
+
+        type, data = self._sendAcquisitionCommand(COMMAND_GET_GRAYSCALE, AUTO_REPEAT, dataSize)
+        return data if pooled else bytearray(data)
+
+    def getDcs(self, pooled=False):
+        '''
+        get DCS, the 4 raw differential correlation samples the distance is computed from.
+
+        Parameters
+        ----------
+        pooled : bool
+            if True, return a memoryview into the receive buffer instead of a copy, it is only valid
+            until the next read from the sensor.
+        '''
+        dataSize = self._getFrameDataSize(COMMAND_GET_DCS)
+
+        type, data = self._sendAcquisitionCommand(COMMAND_GET_DCS, AUTO_REPEAT, dataSize)
+        return data if pooled else bytearray(data)
+
+    def getDcsDistanceAmplitude(self, pooled=False):
+        '''
+        get DCS, Distance and Amplitude at once.
+
+        Parameters
+        ----------
+        pooled : bool
+            if True, return a memoryview into the receive buffer instead of a copy, it is only valid
+            until the next read from the sensor.
+        '''
+        dataSize = self._getFrameDataSize(COMMAND_GET_DCS_DISTANCE_AMPLITUDE)
+
+        type, data = self._sendAcquisitionCommand(COMMAND_GET_DCS_DISTANCE_AMPLITUDE, AUTO_REPEAT, dataSize)
+        return data if pooled else bytearray(data)
+
+    def startStream(self, command):
+        '''
+        put the sensor into stream mode, the sensor then continuously sends frames
+        of the given acquisition command without being requested for each frame.
+
+        Parameters
+        ----------
+        command
+            acquisition command, see _getFrameDataSize(command)
+        '''
+        if self._streaming :
+            raise Exception("Stream is already started!")
+
+        data = bytearray(COMMAND_SIZE_TOTAL)
+
+        ## Add the command
+        data[COMMAND_INDEX_COMMAND] = command
+
+        ## Request continuous output
+        data[COMMAND_INDEX_DATA] = STREAM
+
+        with self._lock :
+            self._streamSize = self._getFrameDataSize(command)
+
+            if self._write(data) > 0 :
+                self._streaming = True
+
+        return self._streaming
+
+    def readStream(self, pooled=False):
+        '''
+        read next frame sent by the sensor in stream mode.
+
+        Parameters
+        ----------
+        pooled : bool
+            if True, return a memoryview into the receive buffer instead of a copy, it is only valid
+            until the next read from the sensor.
+        '''
+        if not self._streaming :
+            raise Exception("Stream is not started!")
+
+        type, data = self._read(self._streamSize)
+        return data if pooled else bytearray(data)
+
+    def stopStream(self):
+        '''
+        stop stream mode and discard the frames still in flight.
+        '''
+        if not self._streaming :
+            return
+
+        with self._lock :
+            self._sendStopStream()
+            sleep(STREAM_STOP_DELAY)
+            self._flushStream()
+
+    def _sendStopStream(self):
+
+        self._streaming = False
+
+        data = bytearray(COMMAND_SIZE_TOTAL)
+        data[COMMAND_INDEX_COMMAND] = COMMAND_STOP_STREAM
+        self._write(data)
+
+    def _flushStream(self):
+
+        ## the sensor may finish sending the current frame after the stop command, wait
+        ## STREAM_STOP_DELAY after _sendStopStream() then drop it
+        if self._ser.is_open :
+            self._ser.reset_input_buffer()
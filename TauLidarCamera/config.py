@@ -0,0 +1,209 @@
+from .constants import *
+
+class ConfigurationError(Exception) :
+    '''
+    Error of a camera parameter, either invalid or not acknowledged by the camera.
+
+    Attributes
+    ----------
+    parameter:
+        name of the parameter, for example 'integrationTime3d[0]'.
+    '''
+    def __init__(self, parameter, message) :
+        super().__init__("%s: %s" % (parameter, message))
+        self.parameter = parameter
+
+def _check(parameter, value, minimum, maximum) :
+    if not isinstance(value, int) or value < minimum or value > maximum :
+        raise ConfigurationError(parameter, "%r is out of range [%d, %d]" % (value, minimum, maximum))
+
+def _checkEnabled(parameter, value) :
+    if value not in (True, False) :
+        raise ConfigurationError(parameter, "%r is not True or False" % (value,))
+
+def _checkTuple(parameter, value, length) :
+    if not isinstance(value, (tuple, list)) or len(value) != length :
+        raise ConfigurationError(parameter, "%r is not a tuple of %d values" % (value, length))
+
+def _checkEvenRows(roi) :
+    x0, y0, x1, y1 = roi
+    if (y1 - y0 + 1) % 2 :
+        raise ConfigurationError('roi', "%r has %d rows, HDR_SPATIAL needs an even number of rows" % (roi, y1 - y0 + 1))
+
+def _indexed(value) :
+    ## a single value is for index 0, a dict gives the value of each index
+    if isinstance(value, dict) :
+        return sorted(value.items())
+    return [(0, value)]
+
+class CameraConfig :
+    '''
+    A set of camera parameters, validated up front and applied at once with Camera.configure(config).
+
+    Parameters left to None are not changed. For example, to switch between a near and a far profile:
+
+        near = CameraConfig(integrationTime3d=200, minimalAmplitude=60)
+        far  = CameraConfig(integrationTime3d=1000, minimalAmplitude=10)
+
+        camera.configure(far)
+
+    Attributes
+    ----------
+    modulationFrequency:
+        VALUE_10MHZ or VALUE_20MHZ.
+    modulationChannel:
+        0 - 10.
+    mode:
+        camera mode, 0 for wide FOV.
+    hdr:
+        HDR_OFF, HDR_SPATIAL or HDR_TEMPORAL, HDR_SPATIAL needs a ROI of an even number of rows.
+    integrationTime3d:
+        0 - 1000, or a dict of integration time by index.
+    integrationTimeGrayscale:
+        0 - VALUE_INTEGRATION_TIME_GRAYSCALE_MAX (25000).
+    minimalAmplitude:
+        minimal amplitude, or a dict of minimal amplitude by index.
+    offset:
+        distance offset.
+    roi:
+        (x0, y0, x1, y1) tuple.
+    temporalFilter:
+        (factor, threshold, edgeThreshold) tuple, factor 0 - 1000 for 0.0 - 1.0, see Camera.setTemporalFilter().
+    singleSpotFilter:
+        (factor, threshold) tuple, see Camera.setSingleSpotFilter().
+    gaussianFilter:
+        True or False.
+    dcsFilter:
+        True or False.
+    frameRate:
+        maximum frames per second, 0 for no limit.
+    '''
+    def __init__(self, modulationFrequency=None, modulationChannel=None, mode=None, hdr=None,
+                 integrationTime3d=None, integrationTimeGrayscale=None, minimalAmplitude=None, offset=None, roi=None,
+                 temporalFilter=None, singleSpotFilter=None, gaussianFilter=None, dcsFilter=None, frameRate=None) :
+        self.modulationFrequency      = modulationFrequency
+        self.modulationChannel        = modulationChannel
+        self.mode                     = mode
+        self.hdr                      = hdr
+        self.integrationTime3d        = integrationTime3d
+        self.integrationTimeGrayscale = integrationTimeGrayscale
+        self.minimalAmplitude         = minimalAmplitude
+        self.offset                   = offset
+        self.roi                      = roi
+        self.temporalFilter           = temporalFilter
+        self.singleSpotFilter         = singleSpotFilter
+        self.gaussianFilter           = gaussianFilter
+        self.dcsFilter                = dcsFilter
+        self.frameRate                = frameRate
+
+    def validate(self) :
+        '''
+        Check all parameters.
+
+        Raises
+        ----------
+        ConfigurationError
+            The first invalid parameter.
+        '''
+        if self.modulationFrequency is not None and self.modulationFrequency not in (VALUE_10MHZ, VALUE_20MHZ) :
+            raise ConfigurationError('modulationFrequency', "%r is not VALUE_10MHZ or VALUE_20MHZ" % self.modulationFrequency)
+
+        if self.modulationChannel is not None :
+            _check('modulationChannel', self.modulationChannel, 0, 10)
+
+        if self.mode is not None :
+            _check('mode', self.mode, MODE_BEAM_A, MODE_BEAM_AB_INTERLEAVED_DATA)
+
+        if self.hdr is not None and self.hdr not in (HDR_OFF, HDR_SPATIAL, HDR_TEMPORAL) :
+            raise ConfigurationError('hdr', "%r is not HDR_OFF, HDR_SPATIAL or HDR_TEMPORAL" % self.hdr)
+
+        if self.integrationTime3d is not None :
+            for index, t in _indexed(self.integrationTime3d) :
+                _check('integrationTime3d[%r]' % index, index, 0, 0xFF)
+                _check('integrationTime3d[%d]' % index, t, 0, 1000)
+
+        if self.integrationTimeGrayscale is not None :
+            _check('integrationTimeGrayscale', self.integrationTimeGrayscale, 0, VALUE_INTEGRATION_TIME_GRAYSCALE_MAX)
+
+        if self.minimalAmplitude is not None :
+            for index, amplitude in _indexed(self.minimalAmplitude) :
+                _check('minimalAmplitude[%r]' % index, index, 0, 0xFF)
+                _check('minimalAmplitude[%d]' % index, amplitude, 0, 0xFFFF)
+
+        if self.offset is not None :
+            _check('offset', self.offset, -0x8000, 0x7FFF)
+
+        if self.roi is not None :
+            if len(self.roi) != 4 :
+                raise ConfigurationError('roi', "%r is not a (x0, y0, x1, y1) tuple" % (self.roi,))
+            x0, y0, x1, y1 = self.roi
+            _check('roi', x0, 0, 159)
+            _check('roi', x1, x0, 159)
+            _check('roi', y0, 0, 59)
+            _check('roi', y1, y0, 59)
+
+            if self.hdr == HDR_SPATIAL :
+                _checkEvenRows(self.roi)
+
+        if self.temporalFilter is not None :
+            _checkTuple('temporalFilter', self.temporalFilter, 3)
+            factor, threshold, edgeThreshold = self.temporalFilter
+            _check('temporalFilter', factor, 0, VALUE_TEMPORAL_FILTER_FACTOR_MAX)
+            _check('temporalFilter', threshold, 0, 0xFFFF)
+            _check('temporalFilter', edgeThreshold, 0, 0xFFFF)
+
+        if self.singleSpotFilter is not None :
+            _checkTuple('singleSpotFilter', self.singleSpotFilter, 2)
+            factor, threshold = self.singleSpotFilter
+            _check('singleSpotFilter', factor, 0, VALUE_TEMPORAL_FILTER_FACTOR_MAX)
+            _check('singleSpotFilter', threshold, 0, 0xFFFF)
+
+        if self.gaussianFilter is not None :
+            _checkEnabled('gaussianFilter', self.gaussianFilter)
+
+        if self.dcsFilter is not None :
+            _checkEnabled('dcsFilter', self.dcsFilter)
+
+        if self.frameRate is not None :
+            _check('frameRate', self.frameRate, 0, 0xFFFF)
+
+    def _validateWith(self, camera) :
+        ## the ROI and the HDR mode are checked together, the one not in this config is the current one of the camera
+        self.validate()
+
+        CameraConfig(hdr=self.hdr if self.hdr is not None else camera.hdr(),
+                     roi=self.roi if self.roi is not None else camera.roi()).validate()
+
+    def _apply(self, camera, force) :
+        ## same order as Camera.setDefaultParameters()
+        if self.modulationFrequency is not None :
+            camera.setModulationFrequency(self.modulationFrequency, force)
+        if self.modulationChannel is not None :
+            camera.setModulationChannel(self.modulationChannel, force)
+        if self.mode is not None :
+            camera.setMode(self.mode, force)
+        ## the ROI and the HDR mode were validated together, the setters would check each against the current other one
+        if self.hdr is not None :
+            camera._comm.setHdr(self.hdr, force)
+        if self.integrationTime3d is not None :
+            for index, t in _indexed(self.integrationTime3d) :
+                camera.setIntegrationTime3d(index, t, force)
+        if self.integrationTimeGrayscale is not None :
+            camera.setIntegrationTimeGrayscale(self.integrationTimeGrayscale, force)
+        if self.minimalAmplitude is not None :
+            for index, amplitude in _indexed(self.minimalAmplitude) :
+                camera.setMinimalAmplitude(index, amplitude, force)
+        if self.offset is not None :
+            camera.setOffset(self.offset, force)
+        if self.roi is not None :
+            camera._comm.setRoi(*self.roi, force=force)
+        if self.temporalFilter is not None :
+            camera.setTemporalFilter(*self.temporalFilter, force=force)
+        if self.singleSpotFilter is not None :
+            camera.setSingleSpotFilter(*self.singleSpotFilter, force=force)
+        if self.gaussianFilter is not None :
+            camera.setGaussianFilter(self.gaussianFilter, force)
+        if self.dcsFilter is not None :
+            camera.setDcsFilter(self.dcsFilter, force)
+        if self.frameRate is not None :
+            camera.setFrameRate(self.frameRate, force)
@@ -6,6 +6,9 @@ COMMAND_SIZE_OVERHEAD = 8                                   ## COMMAND_SIZE_HEAD
 COMMAND_START_MARK    = 0xF5                                ## Command start marking
 COMMAND_INDEX_COMMAND = 1                                   ## Cammand index
 COMMAND_INDEX_DATA    = 2                                   ## Cammand payload data
+PACKET_CACHE_SIZE     = 256                                 ## Maximum number of command packets kept by Communication
+SCAN_TIMEOUT          = 0.5                                 ## Seconds to wait for a port to identify itself when scanning
+STREAM_STOP_DELAY     = 0.1                                 ## Seconds the sensor may keep sending the current frame after the stream is stopped
 
 ## setup commands
 COMMAND_SET_INTEGRATION_TIME_3D = 0x00                      ## Command to set the integration time for 3D operation
@@ -69,6 +72,8 @@ HDR_TEMPORAL = 2                                            ## Temporal HDR
 ## IntegrationTime
 INDEX_INDEX_3D = 2                                          ## Index of the integration time 3d index
 INDEX_INTEGRATION_TIME_3D = 3                               ## Index of the integration time 3d
+INTEGRATION_TIME_DATA_SIZE = 2                              ## Integration time data size
+VALUE_INTEGRATION_TIME_GRAYSCALE_MAX = 25000                ## Maximum integration time grayscale
 
 ## AMPLITUDE
 INDEX_INDEX_AMPLITUDE = 2                                   ## Index of the index
@@ -80,6 +85,12 @@ INDEX_ROI_Y_MIN = 4                                         ## Index of ROI Y MI
 INDEX_ROI_X_MAX = 6                                         ## Index of ROI X MAX
 INDEX_ROI_Y_MAX = 8                                         ## Index of ROI Y MAX
 
+## Filter
+INDEX_TEMPORAL_FILTER_FACTOR = 2                            ## Index of the temporal filter factor
+INDEX_TEMPORAL_FILTER_THRESHOLD = 4                         ## Index of the temporal filter threshold
+INDEX_EDGE_DETECTION_THRESHOLD = 6                          ## Index of the edge detection threshold
+VALUE_TEMPORAL_FILTER_FACTOR_MAX = 1000                     ## Temporal filter factor of 1.0, the new frame only
+
 ## Data format
 DATA_START_MARK    = 0xFA                                   ## Data start marking
 DATA_INDEX_LENGTH  = 2                                      ## Data length
@@ -126,3 +137,14 @@ SHIFT_VERSION = 0
 
 ## TOF 635 image
 TOF_635_IMAGE_HEADER_SIZE  = 80                            ## 635 IMAGE HEADER SIZE
+TOF_635_IMAGE_WIDTH        = 160                           ## 635 IMAGE WIDTH
+TOF_635_IMAGE_HEIGHT       = 60                            ## 635 IMAGE HEIGHT
+
+## Pixel values
+MASK_OUT_CONFIDENCE        = 0x3FFF                        ## 635 IMAGE CONFIDENCE MASK
+VALUE_LIMIT_VALID_PIXEL    = 16000                         ## Distances below are valid
+VALUE_LOW_AMPLITUDE        = 16001                         ## Amplitude below minimal amplitude
+VALUE_ADC_OVERFLOW         = 16002                         ## ADC overflow
+VALUE_SATURATION           = 16003                         ## Saturated pixel
+VALUE_INTERFERENCE         = 16007                         ## Interference detected
+VALUE_EDGE_DETECTED        = 16008                         ## Edge detected
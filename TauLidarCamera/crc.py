@@ -1,3 +1,5 @@
+import zlib
+
 from .constants import *
 from .util import *
 
@@ -5,6 +7,9 @@ POLYNOM = 0x04C11DB7
 CRC_INIT_VALUE = 0xFFFFFFFF
 XOR_VALUE = 0x00000000
 
+## The sensor feeds every byte to the CRC unit as a 32 bit word, most significant bit first.
+## That is CRC-32/MPEG-2 over the byte stream where each byte is preceded by 3 zero bytes.
+
 def _calcCrc32Uint32(crc, data) :
     crc = crc ^ data
     for i in range(32) :
@@ -12,12 +17,21 @@ def _calcCrc32Uint32(crc, data) :
             crc = (crc << 1) ^ POLYNOM
         else :
             crc = crc << 1
-    return(crc)
+    return(crc & 0xFFFFFFFF)
+
+## bit reversed value of each byte
+_REVERSED_BITS = bytes(int('{:08b}'.format(b)[::-1], 2) for b in range(256))
 
 def _calcCrc32_32(data, size) :
-    crc = CRC_INIT_VALUE
-    for i in range(size) :
-        crc = _calcCrc32Uint32(crc, data[i])
+    ## zlib computes the bit reflected CRC, so feed it the bit reversed words and reverse the result back
+    words = bytearray(4 * size)
+    words[3::4] = memoryview(data)[0:size]
+    words = words.translate(_REVERSED_BITS)
+
+    crc = zlib.crc32(words, CRC_INIT_VALUE ^ 0xFFFFFFFF) ^ 0xFFFFFFFF
+
+    crc = (_REVERSED_BITS[crc & 0xFF] << 24) | (_REVERSED_BITS[(crc >> 8) & 0xFF] << 16) | \
+          (_REVERSED_BITS[(crc >> 16) & 0xFF] << 8) | _REVERSED_BITS[crc >> 24]
     return crc ^ XOR_VALUE
 
 def calculateChecksum(data, size) :
@@ -45,18 +59,12 @@ def checksumIsCorrect(array, expectedSize) :
         expected size.
     '''
     ## The received CRC is the one in the data
-    receivedCrc = getUint32LittleEndian(array, SIZE_HEADER + expectedSize)
+    receivedCrc = getUint32LittleEndian(array, COMMAND_SIZE_HEADER + expectedSize)
 
     ## The wanted CRC is the one calculated out of the payload
-    wantedCrc = calculateChecksum(array, SIZE_HEADER + expectedSize)
-
-    byte0 = wantedCrc & 0xFF
-    byte1 = (wantedCrc >> 8) & 0xFF
-    byte2 = (wantedCrc >> 16) & 0xFF
-    byte3 = (wantedCrc >> 24) & 0xFF
-    wantedCrc_value = (byte3 << 24) | (byte2 << 16) | (byte1 << 8) | byte0
+    wantedCrc = calculateChecksum(array, COMMAND_SIZE_HEADER + expectedSize)
 
-    if receivedCrc == wantedCrc_value :
+    if receivedCrc == wantedCrc :
         return True
 
     print("Checksum ERROR!!!")
@@ -0,0 +1,164 @@
+from enum import Enum
+
+import numpy as np
+
+from TauLidarCommon.frame import FrameType
+
+from .constants import *
+
+class ExtendedFrameType(Enum):
+    '''
+    Frame types read by Camera.readFrameRawData(frameType) in addition to FrameType, they have no distance,
+    or raw DCS data, and can only be decoded with Camera.decodeFrame(dataArray, frameType), not composed into a Frame.
+
+    The values follow the values of FrameType, so both are told apart when stored as a number, see frameTypeOf(value).
+    '''
+    AMPLITUDE = 3               ## frame with amplitude only
+    GRAYSCALE = 4               ## frame with grayscale only
+    DCS = 5                     ## frame with the 4 DCS images
+    DCS_DISTANCE_AMPLITUDE = 6  ## frame with the 4 DCS images, distance and amplitude
+
+def frameTypeOf(value) :
+    '''
+    FrameType or ExtendedFrameType of a value.
+    '''
+    if value < ExtendedFrameType.AMPLITUDE.value :
+        return FrameType(value)
+
+    return ExtendedFrameType(value)
+
+## Number of DCS (differential correlation sample) images of the raw DCS data, one per phase
+DCS_COUNT = 4
+
+## Layout of a data point in the raw data of each FrameType, see Camera.readFrameRawData(frameType)
+DISTANCE_DTYPE           = np.dtype([('distance', '<u2')])
+DISTANCE_GRAYSCALE_DTYPE = np.dtype([('grayscale', 'u1'), ('distance', '<u2')])
+DISTANCE_AMPLITUDE_DTYPE = np.dtype([('distance', '<u2'), ('amplitude', '<u2')])
+AMPLITUDE_DTYPE          = np.dtype([('amplitude', '<u2')])
+GRAYSCALE_DTYPE          = np.dtype([('grayscale', 'u1')])
+
+## Layout of the raw data of each frame type: number of uint16 DCS images first, then the data points
+_LAYOUTS = {
+    FrameType.DISTANCE:                       (0, DISTANCE_DTYPE),
+    FrameType.DISTANCE_GRAYSCALE:             (0, DISTANCE_GRAYSCALE_DTYPE),
+    FrameType.DISTANCE_AMPLITUDE:             (0, DISTANCE_AMPLITUDE_DTYPE),
+    ExtendedFrameType.AMPLITUDE:              (0, AMPLITUDE_DTYPE),
+    ExtendedFrameType.GRAYSCALE:              (0, GRAYSCALE_DTYPE),
+    ExtendedFrameType.DCS:                    (DCS_COUNT, None),
+    ExtendedFrameType.DCS_DISTANCE_AMPLITUDE: (DCS_COUNT, DISTANCE_AMPLITUDE_DTYPE),
+}
+
+class DecodedFrame :
+    '''
+    Typed NumPy views of the raw data of a frame, no data is copied.
+
+    The views share memory with the raw data, they change if the raw data is reused, for example
+    raw data read with pooled=True.
+
+    Attributes
+    ----------
+    frameType:
+        FrameType or ExtendedFrameType of the raw data.
+    height:
+        image height.
+    width:
+        image width.
+    distance:
+        (height, width) uint16 distance, including the confidence bits, see depth(). None for frames without distance.
+    grayscale:
+        (height, width) uint8 grayscale for FrameType.DISTANCE_GRAYSCALE and ExtendedFrameType.GRAYSCALE, None otherwise.
+    amplitude:
+        (height, width) uint16 amplitude for FrameType.DISTANCE_AMPLITUDE, ExtendedFrameType.AMPLITUDE and
+        ExtendedFrameType.DCS_DISTANCE_AMPLITUDE, None otherwise.
+    dcs:
+        (DCS_COUNT, height, width) uint16 DCS images for ExtendedFrameType.DCS and ExtendedFrameType.DCS_DISTANCE_AMPLITUDE,
+        None otherwise.
+    '''
+    def __init__(self, frameType, height, width, distance, grayscale=None, amplitude=None, dcs=None) :
+        self.frameType = frameType
+        self.height    = height
+        self.width     = width
+        self.distance  = distance
+        self.grayscale = grayscale
+        self.amplitude = amplitude
+        self.dcs       = dcs
+
+    def depth(self, out=None) :
+        '''
+        Distance in millimeters with the confidence bits masked out, values from VALUE_LIMIT_VALID_PIXEL
+        up are not distances but pixel states such as VALUE_LOW_AMPLITUDE or VALUE_SATURATION.
+
+        Parameters
+        ----------
+        out : numpy.ndarray, optional
+            (height, width) uint16 array to write into, a new array is returned if not given.
+        '''
+        return np.bitwise_and(self.distance, MASK_OUT_CONFIDENCE, out=out)
+
+def frameDataSize(frameType, width=TOF_635_IMAGE_WIDTH, height=TOF_635_IMAGE_HEIGHT) :
+    '''
+    Size in bytes of the raw data of a frame.
+    '''
+    planes, dtype = _LAYOUTS[frameType]
+    itemsize = 0 if dtype is None else dtype.itemsize
+
+    return (2 * planes + itemsize) * width * height
+
+def frameShape(roi=None, hdr=HDR_OFF) :
+    '''
+    Image size of the frames read with a ROI and HDR mode, see Camera.roi() and Camera.hdr().
+
+    With HDR_SPATIAL the sensor merges each pair of rows of the ROI into one image row, the image
+    has half the rows of the ROI.
+
+    Returns
+    ----------
+    tuple
+        (width, height, rows), rows is the number of sensor rows in each image row.
+    '''
+    x0, y0, x1, y1 = roi if roi is not None else (0, 0, TOF_635_IMAGE_WIDTH - 1, TOF_635_IMAGE_HEIGHT - 1)
+    rows = 2 if hdr == HDR_SPATIAL else 1
+
+    return (x1 - x0 + 1, (y1 - y0 + 1) // rows, rows)
+
+def decodeFrame(dataArray, frameType, width=TOF_635_IMAGE_WIDTH, height=TOF_635_IMAGE_HEIGHT) :
+    '''
+    Decode the raw data returned by Camera.readFrameRawData(frameType) into typed NumPy views, without copying.
+
+    Parameters
+    ----------
+    dataArray : bytearray or memoryview
+        raw data of the frame.
+    frameType : FrameType or ExtendedFrameType
+        FrameType of the raw data.
+    width : int, optional
+        image width.
+    height : int, optional
+        image height.
+
+    Returns
+    ----------
+    DecodedFrame
+        The decoded frame, or None if the raw data is too short.
+    '''
+    planes, dtype = _LAYOUTS[frameType]
+
+    count = width * height
+    if len(dataArray) < frameDataSize(frameType, width, height) :
+        print("Bad frame ignored, bytes length: %d" % len(dataArray))
+        return None
+
+    dcs = None
+    if planes :
+        dcs = np.frombuffer(dataArray, dtype='<u2', count=planes * count).reshape(planes, height, width)
+
+    names = () if dtype is None else dtype.names
+    points = None
+    if dtype is not None :
+        points = np.frombuffer(dataArray, dtype=dtype, count=count, offset=2 * planes * count).reshape(height, width)
+
+    distance  = points['distance'] if 'distance' in names else None
+    grayscale = points['grayscale'] if 'grayscale' in names else None
+    amplitude = points['amplitude'] if 'amplitude' in names else None
+
+    return DecodedFrame(frameType, height, width, distance, grayscale, amplitude, dcs)
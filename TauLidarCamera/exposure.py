@@ -0,0 +1,214 @@
+import time
+
+import numpy as np
+
+from TauLidarCommon.frame import FrameType
+
+from .constants import *
+from .config import CameraConfig
+
+AMPLITUDE_HISTOGRAM_BINS  = 256  ## bins of the amplitude histogram
+AMPLITUDE_HISTOGRAM_SHIFT = 4    ## each bin holds 16 amplitude values, higher amplitudes are in the last bin
+
+class AutoExposure :
+    '''
+    Adjust the integration time of a camera from the amplitude of the frames it sends, so bright targets
+    are not saturated and dark targets are not lost under the minimal amplitude.
+
+    Give every decoded frame to update(decoded):
+
+        exposure = AutoExposure(camera, target=500)
+
+        while True:
+            dataArray = camera.readFrameRawData(FrameType.DISTANCE_AMPLITUDE)
+            decoded = Camera.decodeFrame(dataArray, FrameType.DISTANCE_AMPLITUDE, camera.roi(), camera.hdr())
+
+            exposure.update(decoded)
+
+    The integration time is scaled so the amplitude percentile of the frame reaches the target, and shortened
+    when too many pixels are saturated. Frames without amplitude, such as FrameType.DISTANCE, are only
+    controlled by their saturated and low amplitude pixels.
+
+    To avoid sending a command for every frame, the integration time is kept while the amplitude is within
+    the tolerance of the target, it changes at most once per interval and by at most maxStep at once.
+    It is not lengthened while saturated pixels remain, so it does not swing between two values.
+
+    update(decoded) may be called while a capture, a CameraGroup or a FramePipeline reads the frames in another
+    thread, the command waits for the frame being read, see Camera.startCapture(). The integration time can not be
+    changed in stream mode, the command would be mixed with the frames.
+
+    Attributes
+    ----------
+    integrationTime:
+        current integration time, the last one acknowledged by the camera.
+    amplitude:
+        amplitude percentile of the last frame, None for frames without amplitude.
+    saturated:
+        fraction of saturated pixels of the last frame, VALUE_SATURATION or VALUE_ADC_OVERFLOW.
+    underexposed:
+        fraction of pixels of the last frame below the minimal amplitude, VALUE_LOW_AMPLITUDE.
+    histogram:
+        amplitude histogram of the last frame, AMPLITUDE_HISTOGRAM_BINS counts, None for frames without amplitude.
+    adjustments:
+        number of times the integration time was changed.
+    '''
+
+    def __init__(self, camera, target=500, percentile=0.9, tolerance=0.2, maxSaturated=0.01, maxUnderexposed=0.2,
+                 minTime=20, maxTime=1000, maxStep=1.5, interval=0.2, index=0) :
+        '''
+        Parameters
+        ----------
+        camera : Camera
+            opened camera.
+        target : int, optional
+            amplitude the percentile of each frame should reach.
+        percentile : float, optional
+            0.0 - 1.0, fraction of the measured pixels below the amplitude compared to the target.
+        tolerance : float, optional
+            relative difference between the amplitude and the target within which nothing changes.
+        maxSaturated : float, optional
+            fraction of saturated pixels above which the integration time is shortened.
+        maxUnderexposed : float, optional
+            fraction of low amplitude pixels above which the integration time is lengthened, frames without amplitude only.
+        minTime, maxTime : int, optional
+            range of the integration time, see Camera.setIntegrationTime3d(index, t).
+        maxStep : float, optional
+            largest ratio between two integration times.
+        interval : float, optional
+            minimum seconds between two changes, the camera needs a few frames to apply a change.
+        index : int, optional
+            index of the integration time controlled.
+        '''
+        CameraConfig(integrationTime3d={index: minTime}).validate()
+        CameraConfig(integrationTime3d={index: maxTime}).validate()
+
+        if maxStep <= 1.0 :
+            raise Exception("maxStep must be greater than 1.0")
+
+        self._camera = camera
+        self._target = target
+        self._percentile = percentile
+        self._tolerance = tolerance
+        self._maxSaturated = maxSaturated
+        self._maxUnderexposed = maxUnderexposed
+        self._minTime = minTime
+        self._maxTime = maxTime
+        self._maxStep = maxStep
+        self._interval = interval
+        self._index = index
+        self._changed = None  ## time of the last change
+
+        integrationTime = camera.integrationTime3d(index)
+        if integrationTime is None :
+            integrationTime = camera.getIntegrationTime3d()
+
+        self.integrationTime = integrationTime if integrationTime is not None else minTime
+        self.amplitude = None
+        self.saturated = 0.0
+        self.underexposed = 0.0
+        self.histogram = None
+        self.adjustments = 0
+
+    def update(self, decoded) :
+        '''
+        Measure a decoded frame and change the integration time of the camera if needed.
+
+        Parameters
+        ----------
+        decoded : DecodedFrame
+            frame read with the current integration time, see Camera.decodeFrame(dataArray, frameType).
+
+        Returns
+        ----------
+        bool
+            True if the integration time was changed, False as well if the camera did not acknowledge it, it is then
+            tried again after the interval.
+        '''
+        self._measure(decoded)
+
+        factor = self._factor()
+        if factor == 1.0 :
+            return False
+
+        now = time.monotonic()
+        if self._changed is not None and now - self._changed < self._interval :
+            return False
+
+        integrationTime = int(round(min(max(self.integrationTime * factor, self._minTime), self._maxTime)))
+        if integrationTime == self.integrationTime :
+            return False
+
+        if self._camera.isStreaming() :
+            raise Exception("Camera is streaming, the integration time can not be changed!")
+
+        self._camera.setIntegrationTime3d(self._index, integrationTime)
+        self._changed = now
+
+        if self._camera.integrationTime3d(self._index) != integrationTime :
+            return False
+
+        self.integrationTime = integrationTime
+        self.adjustments += 1
+
+        return True
+
+    def _measure(self, decoded) :
+        measured = None
+
+        if decoded.distance is not None :
+            if decoded.frameType == FrameType.DISTANCE_AMPLITUDE or decoded.dcs is not None :
+                distance = decoded.distance
+            else :
+                distance = decoded.depth()
+
+            size = distance.size
+            low = np.count_nonzero(distance == VALUE_LOW_AMPLITUDE)
+            saturated = np.count_nonzero((distance == VALUE_SATURATION) | (distance == VALUE_ADC_OVERFLOW))
+
+            self.underexposed = low / size
+            self.saturated = saturated / size
+
+            ## the amplitude of the pixels with a distance or too dark, the others have no meaningful amplitude
+            measured = (distance < VALUE_LIMIT_VALID_PIXEL) | (distance == VALUE_LOW_AMPLITUDE)
+
+        if decoded.amplitude is None :
+            self.amplitude = None
+            self.histogram = None
+            return
+
+        amplitude = decoded.amplitude if measured is None else decoded.amplitude[measured]
+
+        bins = np.minimum(np.right_shift(amplitude.reshape(-1), AMPLITUDE_HISTOGRAM_SHIFT), AMPLITUDE_HISTOGRAM_BINS - 1)
+        self.histogram = np.bincount(bins, minlength=AMPLITUDE_HISTOGRAM_BINS)
+
+        count = int(self.histogram.sum())
+        if count == 0 :
+            self.amplitude = 0
+            return
+
+        ## middle of the bin holding the percentile
+        cumulative = np.cumsum(self.histogram)
+        percentileBin = int(np.searchsorted(cumulative, self._percentile * count))
+        self.amplitude = (percentileBin << AMPLITUDE_HISTOGRAM_SHIFT) + (1 << AMPLITUDE_HISTOGRAM_SHIFT) // 2
+
+    def _factor(self) :
+        ## too many saturated pixels, shorten whatever the amplitude
+        if self.saturated > self._maxSaturated :
+            return 1.0 / self._maxStep
+
+        if self.amplitude is None :
+            factor = self._maxStep if self.underexposed > self._maxUnderexposed else 1.0
+        elif self.amplitude == 0 :
+            factor = self._maxStep
+        else :
+            factor = self._target / self.amplitude
+            if abs(factor - 1.0) <= self._tolerance :
+                return 1.0
+
+            factor = min(max(factor, 1.0 / self._maxStep), self._maxStep)
+
+        ## saturated pixels remain, lengthening would saturate more of them
+        if factor > 1.0 and self.saturated > self._maxSaturated / 2 :
+            return 1.0
+
+        return factor
@@ -0,0 +1,173 @@
+import array as arr
+
+import numpy as np
+
+from TauLidarCommon.color import ColorMode
+from TauLidarCommon.frame import FrameType, Frame
+
+from .constants import *
+from .decoder import decodeFrame
+
+class LazyFrame(Frame) :
+    '''
+    Frame computing data_depth, data_depth_rgb, data_grayscale, data_amplitude and points_3d only when
+    they are first accessed, each one is computed once and kept.
+
+    The attributes have the same types and values as a Frame composed by Camera.composeFrame(dataArray, frameType),
+    so a LazyFrame can be used wherever a Frame is expected. An application which only reads data_depth
+    does not pay for the colors and the 3D points.
+
+    Attributes
+    ----------
+    frameType:
+        FrameType of the raw data.
+    decoded:
+        DecodedFrame of the raw data, typed NumPy views for the fastest access, see Camera.decodeFrame(dataArray, frameType).
+    '''
+
+    def __init__(self, decoded, dataArray, rays, lut, colorMode=ColorMode.DISTANCE) :
+        '''
+        Use LazyFrame.compose(dataArray, frameType, rays, colorizer, width, height) to create a LazyFrame.
+        '''
+        self.height    = decoded.height
+        self.width     = decoded.width
+        self.frameType = decoded.frameType
+        self.decoded   = decoded
+        self._data     = dataArray
+
+        self._rays = rays
+        self._lut = lut
+        self._colorMode = colorMode
+
+        self._distance = None
+        self._valid = None
+        self._colors = None
+
+        self._data_depth = None
+        self._data_depth_rgb = None
+        self._data_grayscale = None
+        self._data_amplitude = None
+        self._points_3d = None
+
+    @staticmethod
+    def compose(dataArray, frameType, rays, colorizer, width=TOF_635_IMAGE_WIDTH, height=TOF_635_IMAGE_HEIGHT) :
+        '''
+        Create a LazyFrame of the raw data, only the data size is checked until the attributes are accessed.
+
+        Parameters
+        ----------
+        dataArray : bytearray
+            raw data of the frame, kept by the frame.
+        frameType : FrameType
+            FrameType of the raw data.
+        rays : numpy.ndarray
+            (width * height, 3) ray table of the frame ROI, see PointCloudProjector.rays.
+        colorizer : DepthColorizer
+            colors of the distance, the range and ColorMode at the time of the call are used.
+        width : int, optional
+            image width.
+        height : int, optional
+            image height.
+
+        Returns
+        ----------
+        LazyFrame
+            The frame, or None if the raw data is too short.
+        '''
+        if not isinstance(frameType, FrameType) :
+            raise Exception("%s frames can not be composed, use decodeFrame(dataArray, frameType)" % frameType.name)
+
+        decoded = decodeFrame(dataArray, frameType, width, height)
+        if decoded is None :
+            return None
+
+        masked = frameType != FrameType.DISTANCE_AMPLITUDE
+        lut = colorizer.lookupTable(masked, ColorMode.DISTANCE)
+
+        return LazyFrame(decoded, dataArray, rays, lut, colorizer._colorMode)
+
+    def __reduce__(self) :
+        ## pickled as a Frame with all attributes computed, the lookup and ray tables are not sent
+        return (Frame, (self.height, self.width, self.data_depth, self.data_depth_rgb, self.data_grayscale,
+                        self.data_amplitude, self.points_3d, bytearray(self._data)))
+
+    def _distances(self) :
+        if self._distance is None :
+            decoded = self.decoded
+
+            if self.frameType == FrameType.DISTANCE_AMPLITUDE :
+                self._distance = decoded.distance.reshape(-1)
+            else :
+                self._distance = decoded.depth().reshape(-1)
+
+            self._valid = self._distance < VALUE_LIMIT_VALID_PIXEL
+
+        return self._distance
+
+    def _depthColors(self) :
+        if self._colors is None :
+            self._colors = np.take(self._lut, self.decoded.distance.reshape(-1), axis=0)
+
+        return self._colors
+
+    @property
+    def data_depth(self) :
+        if self._data_depth is None :
+            distance = self._distances()
+
+            z = self._rays[:, 2] * distance
+            z[~self._valid] = np.nan
+
+            self._data_depth = _toArray('f', z)
+
+        return self._data_depth
+
+    @property
+    def data_depth_rgb(self) :
+        if self._data_depth_rgb is None :
+            self._data_depth_rgb = _toArray('h', self._depthColors().astype(np.int16).reshape(-1))
+
+        return self._data_depth_rgb
+
+    @property
+    def data_grayscale(self) :
+        if self._data_grayscale is None :
+            grayscale = self.decoded.grayscale
+            values = np.empty(0, dtype=np.int16) if grayscale is None else grayscale.reshape(-1).astype(np.int16)
+
+            self._data_grayscale = _toArray('h', values)
+
+        return self._data_grayscale
+
+    @property
+    def data_amplitude(self) :
+        if self._data_amplitude is None :
+            amplitude = self.decoded.amplitude
+            values = np.empty(0, dtype=np.float32) if amplitude is None else amplitude.reshape(-1).astype(np.float32)
+
+            self._data_amplitude = _toArray('f', values)
+
+        return self._data_amplitude
+
+    @property
+    def points_3d(self) :
+        if self._points_3d is None :
+            distance = self._distances()
+            valid = self._valid
+
+            points = (self._rays[valid] * distance[valid, None]).astype(np.float64)
+
+            grayscale = self.decoded.grayscale
+            if self._colorMode == ColorMode.GRAYSCALE and grayscale is not None :
+                colors = np.repeat(grayscale.reshape(-1)[valid, None], 3, axis=1)
+            else :
+                colors = self._depthColors()[valid][:, ::-1]  ## BGR to RGB
+
+            self._points_3d = [p + c for p, c in zip(points.tolist(), colors.tolist())]
+
+        return self._points_3d
+
+def _toArray(typecode, values) :
+    data = arr.array(typecode)
+    data.frombytes(values.tobytes())
+    return data
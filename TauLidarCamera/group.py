@@ -0,0 +1,223 @@
+import time
+
+from TauLidarCommon.frame import FrameType
+
+from .constants import *
+from .camera import Camera
+from .capture import CapturePolicy
+
+MODULATION_CHANNELS = 11  ## modulation channels 0 - 10
+
+class CameraFrame :
+    '''
+    Raw frame of one camera in a CameraGroup.
+
+    Attributes
+    ----------
+    uid:
+        uid of the camera.
+    port:
+        serial port of the camera.
+    timestamp:
+        host time the frame was received.
+    frameType:
+        FrameType of the raw data.
+    dataArray:
+        raw data, the same as returned by Camera.readFrameRawData(frameType).
+    roi:
+        ROI of the camera, (x0, y0, x1, y1).
+    hdr:
+        HDR mode of the camera.
+    '''
+    def __init__(self, uid, port, timestamp, frameType, dataArray, roi=None, hdr=HDR_OFF) :
+        self.uid       = uid
+        self.port      = port
+        self.timestamp = timestamp
+        self.frameType = frameType
+        self.dataArray = dataArray
+        self.roi       = roi
+        self.hdr       = hdr
+
+    def compose(self) :
+        '''
+        Compose the Frame of the raw data, see Camera.composeFrame(dataArray, frameType, roi, hdr).
+        '''
+        return Camera.composeFrame(self.dataArray, self.frameType, self.roi, self.hdr)
+
+class FrameSet :
+    '''
+    The latest frame of every camera in a CameraGroup.
+
+    Attributes
+    ----------
+    frames:
+        dict of CameraFrame by camera uid, cameras without a frame in time are missing.
+    timestamp:
+        host time the most recent frame of the set was received.
+    '''
+    def __init__(self, frames) :
+        self.frames = frames
+        self.timestamp = max([f.timestamp for f in frames.values()], default=None)
+
+    def __len__(self) :
+        return len(self.frames)
+
+    def __iter__(self) :
+        return iter(self.frames.values())
+
+class CameraGroup :
+    '''
+    Acquire frames from several cameras in parallel.
+
+    Each camera is read by its own capture thread (see Camera.startCapture), so the frame rate of each
+    camera does not drop with the number of cameras. To open all connected cameras:
+
+        group = CameraGroup.open()
+        group.start(FrameType.DISTANCE)
+
+        while True:
+            for cameraFrame in group.read():
+                frame = cameraFrame.compose()
+
+        group.close()
+    '''
+
+    def __init__(self, cameras, assignChannels=True) :
+        '''
+        Parameters
+        ----------
+        cameras : list
+            opened Camera objects.
+        assignChannels : bool
+            set a different modulation channel on each camera, to avoid interference between them.
+        '''
+        self._cameras = list(cameras)
+        self._infos = [camera.info() for camera in self._cameras]
+        self._frameType = None
+
+        if assignChannels :
+            for i, camera in enumerate(self._cameras) :
+                camera.setModulationChannel(i % MODULATION_CHANNELS)
+
+    @staticmethod
+    def open(ports=None, assignChannels=True) :
+        '''
+        Open a group of cameras.
+
+        Parameters
+        ----------
+        ports : list, optional
+            serial ports of the cameras, all available cameras are opened if not given.
+
+        Returns
+        ----------
+        CameraGroup
+            The group of opened cameras.
+        '''
+        if ports is None :
+            ports = Camera.scan()
+
+        cameras = []
+        try:
+            for port in ports :
+                cameras.append(Camera.open(port))
+        except:
+            for camera in cameras :
+                camera.close()
+            raise
+
+        return CameraGroup(cameras, assignChannels)
+
+    @property
+    def cameras(self) :
+        return self._cameras
+
+    def info(self) :
+        '''
+        Returns
+        ----------
+        list
+            CameraInfo of each camera in the group.
+        '''
+        return list(self._infos)
+
+    def start(self, frameType=FrameType.DISTANCE, depth=2) :
+        '''
+        Start one capture thread per camera.
+
+        Parameters
+        ----------
+        frameType : FrameType
+            type of frames to capture.
+        depth : int
+            frames buffered per camera, the read methods always get the latest one.
+        '''
+        try:
+            for camera in self._cameras :
+                camera.startCapture(frameType, depth, CapturePolicy.LATEST)
+        except:
+            self.stop()
+            raise
+
+        self._frameType = frameType
+
+    def stop(self) :
+        '''
+        Stop the capture threads.
+        '''
+        for camera in self._cameras :
+            camera.stopCapture()
+
+        self._frameType = None
+
+    def read(self, timeout=None) :
+        '''
+        Get the latest frame of every camera, waiting for the cameras without a new frame since the previous read.
+
+        Parameters
+        ----------
+        timeout : float, optional
+            seconds to wait for all cameras, wait forever if not given.
+
+        Returns
+        ----------
+        FrameSet
+            The frames of the cameras which delivered a frame in time.
+        '''
+        if self._frameType is None :
+            raise Exception("Group is not started!")
+
+        deadline = None if timeout is None else time.monotonic() + timeout
+
+        frames = {}
+        for camera, info in zip(self._cameras, self._infos) :
+            remaining = None if deadline is None else max(0, deadline - time.monotonic())
+
+            dataArray, timestamp, roi, hdr = camera._capture.get(remaining)
+            if dataArray is not None :
+                frames[info.uid] = CameraFrame(info.uid, info.port, timestamp, self._frameType, dataArray, roi, hdr)
+
+        return FrameSet(frames)
+
+    def statistics(self) :
+        '''
+        Returns
+        ----------
+        dict
+            (framesCaptured, framesDropped, framesFailed) by camera uid.
+        '''
+        result = {}
+        for camera, info in zip(self._cameras, self._infos) :
+            capture = camera._capture
+            if capture is not None :
+                result[info.uid] = (capture.framesCaptured, capture.framesDropped, capture.framesFailed)
+
+        return result
+
+    def close(self) :
+        '''
+        Stop capturing and close all cameras.
+        '''
+        self.stop()
+        for camera in self._cameras :
+            camera.close()
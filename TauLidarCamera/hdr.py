@@ -0,0 +1,62 @@
+import numpy as np
+
+from TauLidarCommon.frame import FrameType
+
+from .constants import *
+from .decoder import DecodedFrame
+
+def mergeFrames(frames) :
+    '''
+    Merge decoded frames of the same scene taken with different integration times into one frame, see
+    Camera.readHdrFrame(count, frameType).
+
+    Each pixel takes the value of the frame where it is valid, a pixel saturated with a long integration time
+    is taken from a shorter one and a pixel too dark with a short integration time from a longer one.
+    When several frames are valid the highest amplitude wins for FrameType.DISTANCE_AMPLITUDE, the first
+    frame otherwise. Pixels valid in no frame keep the state of the first frame, such as VALUE_SATURATION.
+
+    Parameters
+    ----------
+    frames : list
+        DecodedFrame of the same FrameType and size.
+
+    Returns
+    ----------
+    DecodedFrame
+        The merged frame, its arrays are new and do not share memory with the frames.
+    '''
+    first = frames[0]
+
+    for frame in frames :
+        if frame.frameType != first.frameType or frame.distance.shape != first.distance.shape :
+            raise Exception("Frames of different types or sizes can not be merged")
+
+    distance = np.stack([frame.distance for frame in frames])
+
+    if first.frameType == FrameType.DISTANCE_AMPLITUDE :
+        valid = distance < VALUE_LIMIT_VALID_PIXEL
+    else :
+        valid = np.bitwise_and(distance, MASK_OUT_CONFIDENCE) < VALUE_LIMIT_VALID_PIXEL
+
+    ## score of each pixel of each frame, -1 if invalid, the best frame of every pixel at once
+    if first.amplitude is not None :
+        amplitude = np.stack([frame.amplitude for frame in frames])
+        score = np.where(valid, amplitude.astype(np.int32), -1)
+    else :
+        amplitude = None
+        score = np.where(valid, np.arange(len(frames), 0, -1, dtype=np.int32)[:, None, None], -1)
+
+    best = np.argmax(score, axis=0)[None]
+
+    grayscale = None
+    if first.grayscale is not None :
+        grayscale = np.stack([frame.grayscale for frame in frames])
+
+    return DecodedFrame(first.frameType, first.height, first.width,
+                        _pick(distance, best), _pick(grayscale, best), _pick(amplitude, best))
+
+def _pick(values, best) :
+    if values is None :
+        return None
+
+    return np.take_along_axis(values, best, axis=0)[0]
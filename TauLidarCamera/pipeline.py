@@ -0,0 +1,327 @@
+import collections
+import os
+import queue
+import threading
+import time
+from concurrent.futures import ProcessPoolExecutor, TimeoutError
+
+try:
+    from multiprocessing import shared_memory
+except ImportError : ## Python < 3.8
+    shared_memory = None
+
+from TauLidarCommon.frame import FrameType
+
+from .constants import *
+from .camera import Camera, _FRAME_COMMANDS
+from .communication import _BYTES_PER_PIXEL
+from .decoder import frameShape
+
+PIPELINE_SLOT_SIZE = 12 * TOF_635_IMAGE_WIDTH * TOF_635_IMAGE_HEIGHT  ## raw data of the largest frame, ExtendedFrameType.DCS_DISTANCE_AMPLITUDE
+
+def composeFrame(dataArray, frameType, roi, hdr) :
+    '''
+    Default function of a FramePipeline, compose a Frame in a worker process, see Camera.composeFrame(dataArray, frameType, roi, hdr).
+    '''
+    return Camera.composeFrame(bytearray(dataArray), frameType, roi, hdr)
+
+_workerMemory = None
+_workerSlotSize = 0
+
+def _initWorker(name, slotSize) :
+    global _workerMemory, _workerSlotSize
+
+    _workerMemory = shared_memory.SharedMemory(name=name)
+    _workerSlotSize = slotSize
+
+def _runWorker(function, slot, length, frameType, roi, hdr, colors) :
+    ## the worker composes frames with the colors of the parent process when the frame was submitted,
+    ## the lookup table is only rebuilt when they change
+    start, stop, colorMode = colors
+    Camera.setRange(start, stop)
+    Camera.setColorMode(colorMode)
+
+    offset = slot * _workerSlotSize
+    dataArray = _workerMemory.buf[offset : offset + length]
+
+    try:
+        return function(dataArray, frameType, roi, hdr)
+    finally:
+        dataArray.release()
+
+class FramePipeline :
+    '''
+    Compose frames on a pool of worker processes, so composition scales with the number of cores
+    instead of being limited by the GIL.
+
+    Raw frames are copied into slots of a shared memory block and only the slot index is sent to the
+    workers. Results are returned in the order the frames were submitted:
+
+        pipeline = FramePipeline(workers=4)
+        pipeline.start(camera, FrameType.DISTANCE)
+
+        while True:
+            frame, timestamp = pipeline.get()
+
+        pipeline.close()
+
+    A slot is only reused once its result has been read with get(), when all slots are in use submit()
+    waits, so a slow consumer slows down the acquisition instead of piling up frames.
+
+    The function run by the workers must be a module level function taking (dataArray, frameType, roi, hdr),
+    the dataArray is a memoryview of the slot which is only valid during the call, and its result must be
+    picklable.
+
+    Frames are colored with the range and ColorMode of Camera.setRange() and Camera.setColorMode() in the
+    process submitting them, at the time they are submitted.
+
+    Attributes
+    ----------
+    framesSubmitted:
+        number of frames sent to the workers.
+    framesCompleted:
+        number of results read with get().
+    framesFailed:
+        number of bad or empty reads of the camera.
+    '''
+
+    def __init__(self, function=composeFrame, workers=None, slots=None, slotSize=None) :
+        '''
+        Parameters
+        ----------
+        function : callable, optional
+            function run on each frame by the workers, composeFrame by default.
+        workers : int, optional
+            number of worker processes, the number of CPUs by default.
+        slots : int, optional
+            number of frames in flight, twice the number of workers by default.
+        slotSize : int, optional
+            maximum size of the raw data of a frame, by default the size of the frames read by start(camera, frameType),
+            or PIPELINE_SLOT_SIZE if frames are submitted before the pipeline is started.
+        '''
+        if shared_memory is None :
+            raise Exception("FramePipeline requires Python 3.8 or later!")
+
+        if workers is None :
+            workers = os.cpu_count() or 1
+
+        if slots is None :
+            slots = 2 * workers
+
+        self._function = function
+        self._workers  = workers
+        self._slots    = slots
+        self._slotSize = 0
+        self._memory   = None
+        self._executor = None
+        self._free     = queue.Queue()
+        self._pending  = collections.deque()
+        self._cond     = threading.Condition()
+        self._closed   = False
+        self._running  = False
+        self._thread   = None
+        self._error    = None
+
+        for slot in range(slots) :
+            self._free.put(slot)
+
+        if slotSize is not None :
+            self._open(slotSize)
+
+        self.framesSubmitted = 0
+        self.framesCompleted = 0
+        self.framesFailed    = 0
+
+    def _open(self, slotSize) :
+        ## the shared memory and the workers are created once the size of the frames is known
+        self._slotSize = slotSize
+        self._memory   = shared_memory.SharedMemory(create=True, size=self._slots * slotSize)
+
+        self._executor = ProcessPoolExecutor(self._workers, initializer=_initWorker, initargs=(self._memory.name, slotSize))
+
+    def __len__(self) :
+        return len(self._pending)
+
+    def submit(self, dataArray, frameType, timestamp=None, timeout=None, roi=None, hdr=HDR_OFF) :
+        '''
+        copy a raw frame into a free slot and send it to the workers.
+
+        Parameters
+        ----------
+        dataArray : bytearray or memoryview
+            raw data of the frame, may be pooled, it is copied before returning.
+        frameType : FrameType
+            FrameType of the raw data.
+        timestamp : float, optional
+            host time the frame was received, the current time if not given.
+        timeout : float, optional
+            seconds to wait for a free slot, wait forever if not given.
+        roi : tuple, optional
+            ROI of the frame, see Camera.roi(), the full sensor if not given.
+        hdr : int, optional
+            HDR mode of the frame, see Camera.hdr().
+
+        Returns
+        ----------
+        bool
+            False if no slot was freed in time.
+        '''
+        if self._closed :
+            raise Exception("Pipeline is closed!")
+
+        if self._memory is None :
+            self._open(PIPELINE_SLOT_SIZE)
+
+        length = len(dataArray)
+        if length > self._slotSize :
+            raise Exception("Frame of %d bytes does not fit in a slot of %d bytes" % (length, self._slotSize))
+
+        if timestamp is None :
+            timestamp = time.time()
+
+        try:
+            slot = self._free.get(timeout=timeout)
+        except queue.Empty :
+            return False
+
+        offset = slot * self._slotSize
+        self._memory.buf[offset : offset + length] = dataArray
+
+        colorizer = Camera._colorizer
+        colors = (colorizer._start, colorizer._stop, colorizer._colorMode)
+
+        future = self._executor.submit(_runWorker, self._function, slot, length, frameType, roi, hdr, colors)
+
+        with self._cond :
+            self._pending.append((future, slot, timestamp))
+            self.framesSubmitted += 1
+            self._cond.notify()
+
+        return True
+
+    def get(self, timeout=None) :
+        '''
+        get the result of the oldest submitted frame, results are returned in order to a single consumer.
+
+        Parameters
+        ----------
+        timeout : float, optional
+            seconds to wait for the result, wait forever if not given.
+
+        Returns
+        ----------
+        tuple
+            (result, timestamp), or (None, None) if no result is ready in time or the pipeline is closed.
+
+        Raises
+        ----------
+        Exception
+            The function raised on the frame, or the reader thread stopped on an error.
+        '''
+        deadline = None if timeout is None else time.monotonic() + timeout
+
+        with self._cond :
+            if not self._cond.wait_for(lambda: len(self._pending) > 0 or self._closed or self._error is not None, timeout) :
+                return (None, None)
+
+            if len(self._pending) == 0 :
+                if self._error is not None :
+                    raise Exception("Pipeline stopped: %s" % self._error)
+                return (None, None)
+
+            future, slot, timestamp = self._pending[0]
+
+        remaining = None if deadline is None else max(0, deadline - time.monotonic())
+        try:
+            future.exception(remaining)
+        except TimeoutError :
+            return (None, None)
+
+        with self._cond :
+            self._pending.popleft()
+            self.framesCompleted += 1
+
+        self._free.put(slot)
+
+        return (future.result(), timestamp)
+
+    @property
+    def running(self) :
+        return self._running
+
+    def start(self, camera, frameType=FrameType.DISTANCE_GRAYSCALE) :
+        '''
+        start a thread submitting the frames read with camera.readFrameRawData(frameType).
+
+        Parameters
+        ----------
+        camera : Camera
+            opened camera or Replay, do not call its other read methods while the pipeline is started.
+        frameType : FrameType
+            type of frames to read, the slots are sized for its frames with the current ROI and HDR mode of the camera.
+        '''
+        if self._running :
+            raise Exception("Pipeline is already started!")
+
+        if frameType not in _FRAME_COMMANDS :
+            raise Exception("Unsupported frame type: %s" % frameType)
+
+        ## the size of the raw data as Communication._getFrameDataSize(command), camera may also be a Replay
+        width, height, rows = frameShape(camera.roi(), camera.hdr())
+        slotSize = _BYTES_PER_PIXEL[_FRAME_COMMANDS[frameType]] * width * height
+
+        if self._memory is None :
+            self._open(slotSize)
+        elif slotSize > self._slotSize :
+            raise Exception("Frames of %d bytes do not fit in slots of %d bytes" % (slotSize, self._slotSize))
+
+        self._running = True
+        self._error = None
+        self._thread = threading.Thread(target=self._run, args=(camera, frameType), name='TauLidarPipeline', daemon=True)
+        self._thread.start()
+
+    def stop(self) :
+        '''
+        stop the reader thread, the frames already submitted can still be read with get().
+        '''
+        self._running = False
+        if self._thread is not None :
+            self._thread.join()
+            self._thread = None
+
+    def close(self) :
+        '''
+        stop the reader thread and the workers, and free the shared memory.
+        '''
+        self.stop()
+
+        with self._cond :
+            self._closed = True
+            self._pending.clear()
+            self._cond.notify_all()
+
+        if self._memory is not None :
+            self._executor.shutdown(wait=True)
+
+            self._memory.close()
+            self._memory.unlink()
+            self._memory = None
+
+    def _run(self, camera, frameType) :
+        try :
+            while self._running :
+                dataArray = camera.readFrameRawData(frameType, pooled=True)
+                timestamp = time.time()
+
+                if not dataArray :
+                    self.framesFailed += 1
+                    continue
+
+                while self._running and not self.submit(dataArray, frameType, timestamp, 0.1, camera.roi(), camera.hdr()) :
+                    pass
+        except Exception as e :
+            self._error = e
+            self._running = False
+
+            with self._cond :
+                self._cond.notify_all()
@@ -0,0 +1,160 @@
+import functools
+import math
+
+import numpy as np
+
+from TauLidarCommon.frame import FrameType
+
+from .constants import *
+
+## Field of view of the lens, the same projection as Frame.points_3d
+ANGLE_X = 80.0
+ANGLE_Y = 30.0
+
+THETA_H = math.pi * ANGLE_X / 180.0
+ALPHA_H = (math.pi - THETA_H) / 2
+
+THETA_V = math.pi * ANGLE_Y / 180.0
+ALPHA_V = 2 * math.pi - (THETA_V / 2)
+
+@functools.lru_cache(maxsize=16)
+def rayTable(x0=0, y0=0, x1=TOF_635_IMAGE_WIDTH - 1, y1=TOF_635_IMAGE_HEIGHT - 1, rows=1) :
+    '''
+    Compute the ray of every pixel of a region of interest, the point of a pixel is its ray times its distance in millimeters.
+
+    The tables are cached, the same read-only array is returned for the same region.
+
+    Parameters
+    ----------
+    x0, y0, x1, y1 : int, optional
+        region of interest, the full image by default.
+    rows : int, optional
+        sensor rows merged in each image row, 2 for frames read with HDR_SPATIAL, the ray points to the middle of the rows.
+
+    Returns
+    ----------
+    numpy.ndarray
+        (N, 3) float32 rays in meters per millimeter, N pixels of the region in row order.
+    '''
+    x = np.arange(x0, x1 + 1, dtype=np.float64)
+    y = y0 + rows * np.arange((y1 - y0 + 1) // rows, dtype=np.float64) + (rows - 1) / 2.0
+
+    gammaH = ALPHA_H + x * (THETA_H / TOF_635_IMAGE_WIDTH)
+    gammaV = ALPHA_V + y * (THETA_V / TOF_635_IMAGE_HEIGHT)
+
+    ## Z = |0.001 * distance * sin(gammaH)| * |cos(gammaV)|, X = Z / tan(gammaH), Y = -Z * tan(gammaV)
+    z = 0.001 * np.abs(np.sin(gammaH))[None, :] * np.abs(np.cos(gammaV))[:, None]
+
+    rays = np.empty(z.shape + (3,), dtype=np.float32)
+    rays[..., 0] = z / np.tan(gammaH)[None, :]
+    rays[..., 1] = -z * np.tan(gammaV)[:, None]
+    rays[..., 2] = z
+
+    rays = rays.reshape(-1, 3)
+    rays.flags.writeable = False
+
+    return rays
+
+class PointCloudProjector :
+    '''
+    Project decoded frames to point clouds with a precomputed ray table.
+
+    The ray of each pixel only depends on the lens and the region of interest, the table is computed
+    once per region and the points of a frame are a single multiplication into a reusable buffer:
+
+        projector = PointCloudProjector()
+        points = np.empty((9600, 3), dtype=np.float32)
+
+        decoded = Camera.decodeFrame(camera.readFrameRawData(FrameType.DISTANCE), FrameType.DISTANCE)
+        points, valid = projector.project(decoded, out=points)
+
+    A projector keeps working buffers, use one projector per thread.
+    '''
+
+    def __init__(self, x0=0, y0=0, x1=TOF_635_IMAGE_WIDTH - 1, y1=TOF_635_IMAGE_HEIGHT - 1, rows=1) :
+        '''
+        Parameters
+        ----------
+        x0, y0, x1, y1 : int, optional
+            region of interest of the frames, see Camera.setRoi(x0, y0, x1, y1). The full image by default.
+        rows : int, optional
+            sensor rows merged in each image row, see rayTable(x0, y0, x1, y1, rows).
+        '''
+        self._roi = None
+        self._rays = None
+        self._distance = None
+        self._valid = None
+
+        self.setRoi(x0, y0, x1, y1, rows)
+
+    def setRoi(self, x0, y0, x1, y1, rows=1) :
+        '''
+        set the region of interest of the frames, the ray table is only computed again if the region changes.
+        '''
+        roi = (x0, y0, x1, y1, rows)
+        if roi == self._roi :
+            return
+
+        self._rays = rayTable(x0, y0, x1, y1, rows)
+        self._roi = roi
+
+        size = len(self._rays)
+        self._distance = np.empty(size, dtype=np.uint16)
+        self._valid = np.empty(size, dtype=np.bool_)
+
+    @property
+    def rays(self) :
+        '''
+        (N, 3) float32 ray table of the current region of interest, must not be modified.
+        '''
+        return self._rays
+
+    def project(self, decoded, out=None, minAmplitude=None, mask=None) :
+        '''
+        compute the points of a decoded frame, see Camera.decodeFrame(dataArray, frameType).
+
+        Parameters
+        ----------
+        decoded : DecodedFrame
+            the decoded frame, of the size of the region of interest.
+        out : numpy.ndarray, optional
+            (N, 3) float32 array to write the points into, a new array is returned if not given.
+        minAmplitude : int, optional
+            mask out pixels with a lower amplitude, FrameType.DISTANCE_AMPLITUDE only.
+        mask : numpy.ndarray, optional
+            (N,) bool array to write the valid pixels into, a new array is returned if not given.
+
+        Returns
+        ----------
+        tuple
+            (points, valid), the (N, 3) float32 points in meters, NaN for invalid pixels, and the (N,) bool
+            array of valid pixels.
+        '''
+        rays = self._rays
+
+        if decoded.height * decoded.width != len(rays) :
+            raise Exception("Frame size %dx%d does not match the ROI" % (decoded.width, decoded.height))
+
+        if out is None :
+            out = np.empty(rays.shape, dtype=np.float32)
+
+        if mask is None :
+            mask = np.empty(len(rays), dtype=np.bool_)
+
+        if decoded.frameType == FrameType.DISTANCE_AMPLITUDE :
+            distance = decoded.distance.reshape(-1)
+        else :
+            distance = decoded.depth(out=self._distance.reshape(decoded.height, decoded.width)).reshape(-1)
+
+        np.less(distance, VALUE_LIMIT_VALID_PIXEL, out=mask)
+
+        if minAmplitude is not None and decoded.amplitude is not None :
+            np.greater_equal(decoded.amplitude.reshape(-1), minAmplitude, out=self._valid)
+            np.logical_and(mask, self._valid, out=mask)
+
+        np.multiply(rays, distance[:, None], out=out)
+
+        np.logical_not(mask, out=self._valid)
+        out[self._valid] = np.nan
+
+        return (out, mask)
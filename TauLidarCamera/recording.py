@@ -0,0 +1,435 @@
+import bisect
+import json
+import mmap
+import os
+import queue
+import struct
+import threading
+import time
+from enum import Enum
+
+from .decoder import frameTypeOf
+from .info import CameraInfo
+
+## File layout:
+##
+##     file header   magic, version, metadata size, metadata (JSON)
+##     records       record header (data size, timestamp, frame type) followed by the raw data, one per frame
+##     index         one entry (offset of the record, timestamp, frame type) per frame
+##     footer        offset of the index, number of frames, magic
+##
+## The index and footer are written when the recording is closed, an unclosed recording is read by
+## scanning the records.
+
+RECORDING_MAGIC   = b'TAULIDAR'
+RECORDING_VERSION = 1
+
+_FILE_HEADER   = struct.Struct('<8sHHI')   ## magic, version, reserved, metadata size
+_RECORD_HEADER = struct.Struct('<IdB3x')   ## data size, timestamp, frame type
+_INDEX_ENTRY   = struct.Struct('<QdB7x')   ## record offset, timestamp, frame type
+_FOOTER        = struct.Struct('<QQ8s')    ## index offset, number of frames, magic
+
+RECORDER_QUEUE_SIZE = 64           ## frames waiting for the writer thread before frames are dropped
+RECORDER_BATCH_SIZE = 1024 * 1024  ## bytes gathered into a single write to the file
+
+def _parameterName(key) :
+    if isinstance(key, tuple) :
+        return "%s[%d]" % key
+    return key
+
+class FsyncPolicy(Enum):
+    '''
+    FsyncPolicy Enum, when a Recorder forces the written frames to the storage.
+    '''
+    NEVER = 0  ## leave it to the operating system
+    BATCH = 1  ## after every batch of frames, nothing but the frames in the queue is lost on a power cut
+    CLOSE = 2  ## once when the recorder is closed
+
+class Recorder :
+    '''
+    Record raw frames into a single file, each frame is appended with its timestamp and FrameType.
+
+        recorder = Recorder('session.tau', camera)
+
+        while recording:
+            recorder.write(camera.readFrameRawData(FrameType.DISTANCE_AMPLITUDE), FrameType.DISTANCE_AMPLITUDE)
+
+        recorder.close()
+
+    write() only queues the frame, the file is written by a dedicated thread which gathers the queued
+    frames into large sequential writes, so a slow storage never delays the acquisition. When the
+    queue is full the frame is dropped and counted.
+
+    The seek index is appended when the recorder is closed. Use a Reader to read the recording.
+
+    Attributes
+    ----------
+    framesWritten:
+        number of frames written to the file.
+    framesDropped:
+        number of frames dropped because the queue was full.
+    bytesWritten:
+        number of bytes of frames written to the file.
+    maxQueueDepth:
+        highest number of frames waiting in the queue.
+    '''
+
+    def __init__(self, path, camera=None, metadata=None, queueSize=RECORDER_QUEUE_SIZE, fsync=FsyncPolicy.CLOSE, batchSize=RECORDER_BATCH_SIZE) :
+        '''
+        Parameters
+        ----------
+        path : str
+            file of the recording, overwritten if it exists.
+        camera : Camera, optional
+            camera recorded, its information and the parameters set on it are saved in the file header.
+        metadata : dict, optional
+            application data saved in the file header, must be serializable to JSON.
+        queueSize : int, optional
+            frames waiting for the writer thread before frames are dropped.
+        fsync : FsyncPolicy, optional
+            when the written frames are forced to the storage.
+        batchSize : int, optional
+            bytes gathered into a single write to the file.
+        '''
+        header = {'metadata': metadata}
+
+        if camera is not None :
+            info = camera.info()
+            header['camera'] = {
+                'model':      info.model,
+                'firmware':   info.firmware,
+                'uid':        info.uid,
+                'resolution': info.resolution,
+                'port':       info.port,
+            }
+            header['settings'] = {_parameterName(key): value for key, value in camera._comm._parameters.items()}
+
+        data = json.dumps(header, sort_keys=True).encode('utf-8')
+
+        self._file = open(path, 'wb')
+        self._file.write(_FILE_HEADER.pack(RECORDING_MAGIC, RECORDING_VERSION, 0, len(data)))
+        self._file.write(data)
+
+        self._offset    = _FILE_HEADER.size + len(data)
+        self._index     = []
+        self._fsync     = fsync
+        self._batchSize = batchSize
+        self._queue     = queue.Queue(queueSize)
+        self._error     = None
+
+        self.framesWritten = 0
+        self.framesDropped = 0
+        self.bytesWritten  = 0
+        self.maxQueueDepth = 0
+
+        self._thread = threading.Thread(target=self._run, name='TauLidarRecorder', daemon=True)
+        self._thread.start()
+
+    @property
+    def queueDepth(self) :
+        '''
+        number of frames waiting for the writer thread.
+        '''
+        return self._queue.qsize()
+
+    def write(self, dataArray, frameType, timestamp=None) :
+        '''
+        queue a raw frame to be appended to the file.
+
+        Parameters
+        ----------
+        dataArray : bytearray or memoryview
+            raw data of the frame, as returned by Camera.readFrameRawData(frameType), may be pooled, it is copied before returning.
+        frameType : FrameType
+            FrameType of the raw data.
+        timestamp : float, optional
+            host time the frame was received, the current time if not given.
+
+        Returns
+        ----------
+        bool
+            False if the frame was dropped because the queue was full.
+
+        Raises
+        ----------
+        Exception
+            The writer thread stopped on an error.
+        '''
+        if self._error is not None :
+            raise Exception("Recording failed: %s" % self._error)
+
+        if self._file is None :
+            raise Exception("Recorder is closed!")
+
+        if timestamp is None :
+            timestamp = time.time()
+
+        record = b''.join((_RECORD_HEADER.pack(len(dataArray), timestamp, frameType.value), dataArray))
+
+        try:
+            self._queue.put_nowait((record, timestamp, frameType.value))
+        except queue.Full :
+            self.framesDropped += 1
+            return False
+
+        self.maxQueueDepth = max(self.maxQueueDepth, self._queue.qsize())
+        return True
+
+    def close(self) :
+        '''
+        write the queued frames and the seek index, and close the file.
+
+        Raises
+        ----------
+        Exception
+            The writer thread stopped on an error, the recording is incomplete but still readable.
+        '''
+        if self._file is None :
+            return
+
+        self._queue.put(None)
+        self._thread.join()
+
+        try:
+            self._file.write(b''.join(self._index))
+            self._file.write(_FOOTER.pack(self._offset, len(self._index), RECORDING_MAGIC))
+            self._file.flush()
+
+            if self._fsync != FsyncPolicy.NEVER :
+                os.fsync(self._file.fileno())
+        finally:
+            self._file.close()
+            self._file = None
+
+        if self._error is not None :
+            raise Exception("Recording failed: %s" % self._error)
+
+    def _run(self) :
+        stopped = False
+        while not stopped :
+            batch = [self._queue.get()]
+            if batch[0] is None :
+                break
+
+            ## gather the frames already queued into a single write
+            size = len(batch[0][0])
+            while size < self._batchSize :
+                try:
+                    item = self._queue.get_nowait()
+                except queue.Empty :
+                    break
+
+                if item is None :
+                    stopped = True
+                    break
+
+                batch.append(item)
+                size += len(item[0])
+
+            if self._error is not None :
+                self.framesDropped += len(batch)
+                continue
+
+            try:
+                self._file.write(b''.join([record for record, timestamp, frameType in batch]))
+                self._file.flush()
+
+                if self._fsync == FsyncPolicy.BATCH :
+                    os.fsync(self._file.fileno())
+            except Exception as e :
+                ## keep draining the queue so write() and close() never block
+                self._error = e
+                self.framesDropped += len(batch)
+                continue
+
+            for record, timestamp, frameType in batch :
+                self._index.append(_INDEX_ENTRY.pack(self._offset, timestamp, frameType))
+                self._offset += len(record)
+
+            self.framesWritten += len(batch)
+            self.bytesWritten += size
+
+class Reader :
+    '''
+    Read a recording written by a Recorder, any frame is read with a single seek.
+
+        reader = Reader('session.tau')
+
+        for dataArray, timestamp, frameType in reader:
+            frame = Camera.composeFrame(dataArray, frameType)
+
+        reader.close()
+
+    Attributes
+    ----------
+    info:
+        CameraInfo of the recorded camera, None if not recorded.
+    settings:
+        dict of the parameters set on the camera when the recording started.
+    metadata:
+        application data of the recording.
+    '''
+
+    def __init__(self, path) :
+        '''
+        Parameters
+        ----------
+        path : str
+            file of the recording.
+        '''
+        self._file = open(path, 'rb')
+        self._mmap = None
+
+        try:
+            self._readHeader()
+            self._readIndex()
+        except:
+            self._file.close()
+            raise
+
+    def _readHeader(self) :
+        header = self._file.read(_FILE_HEADER.size)
+        if len(header) < _FILE_HEADER.size :
+            raise Exception("Not a Tau LiDAR recording!")
+
+        magic, version, reserved, size = _FILE_HEADER.unpack(header)
+        if magic != RECORDING_MAGIC :
+            raise Exception("Not a Tau LiDAR recording!")
+
+        if version > RECORDING_VERSION :
+            raise Exception("Unsupported recording version: %d" % version)
+
+        header = json.loads(self._file.read(size).decode('utf-8'))
+
+        camera = header.get('camera')
+        self.info = None if camera is None else CameraInfo(camera['model'], camera['firmware'], camera['uid'], camera['resolution'], camera['port'])
+        self.settings = header.get('settings', {})
+        self.metadata = header.get('metadata')
+
+        self._dataOffset = _FILE_HEADER.size + size
+
+    def _readIndex(self) :
+        fileSize = os.fstat(self._file.fileno()).st_size
+
+        if fileSize >= self._dataOffset + _FOOTER.size :
+            self._file.seek(fileSize - _FOOTER.size)
+            indexOffset, count, magic = _FOOTER.unpack(self._file.read(_FOOTER.size))
+
+            if magic == RECORDING_MAGIC and indexOffset + count * _INDEX_ENTRY.size + _FOOTER.size == fileSize :
+                self._file.seek(indexOffset)
+                entries = _INDEX_ENTRY.iter_unpack(self._file.read(count * _INDEX_ENTRY.size))
+                self._setIndex(list(entries))
+                return
+
+        ## the recording was not closed, rebuild the index from the records
+        self._setIndex(self._scanRecords(fileSize))
+
+    def _scanRecords(self, fileSize) :
+        entries = []
+
+        offset = self._dataOffset
+        while offset + _RECORD_HEADER.size <= fileSize :
+            self._file.seek(offset)
+            size, timestamp, frameType = _RECORD_HEADER.unpack(self._file.read(_RECORD_HEADER.size))
+
+            if offset + _RECORD_HEADER.size + size > fileSize :
+                break ## last record was cut off
+
+            entries.append((offset, timestamp, frameType))
+            offset += _RECORD_HEADER.size + size
+
+        return entries
+
+    def _setIndex(self, entries) :
+        self._offsets    = [entry[0] for entry in entries]
+        self._timestamps = [entry[1] for entry in entries]
+        self._frameTypes = [frameTypeOf(entry[2]) for entry in entries]
+
+    def __len__(self) :
+        return len(self._offsets)
+
+    def __iter__(self) :
+        for i in range(len(self)) :
+            yield self.read(i)
+
+    def timestamp(self, index) :
+        '''
+        get the timestamp of a frame without reading it.
+        '''
+        return self._timestamps[index]
+
+    def find(self, timestamp) :
+        '''
+        get the index of the first frame received at or after timestamp.
+
+        Returns
+        ----------
+        int
+            Index of the frame, len(reader) if all frames were received before timestamp.
+        '''
+        return bisect.bisect_left(self._timestamps, timestamp)
+
+    def read(self, index) :
+        '''
+        read a frame.
+
+        Parameters
+        ----------
+        index : int
+            index of the frame, negative indices count from the last frame.
+
+        Returns
+        ----------
+        tuple
+            (dataArray, timestamp, frameType), dataArray is a new bytearray.
+        '''
+        offset = self._offsets[index]
+
+        self._file.seek(offset)
+        size, timestamp, frameType = _RECORD_HEADER.unpack(self._file.read(_RECORD_HEADER.size))
+
+        dataArray = bytearray(size)
+        self._file.readinto(dataArray)
+
+        return (dataArray, timestamp, self._frameTypes[index])
+
+    def view(self, index) :
+        '''
+        get a frame without copying it, the recording is memory mapped on the first call.
+
+        The view is writable, as required by Camera.composeFrame(dataArray, frameType), but changes are private
+        to the process and never written to the file.
+
+        Parameters
+        ----------
+        index : int
+            index of the frame, negative indices count from the last frame.
+
+        Returns
+        ----------
+        tuple
+            (dataArray, timestamp, frameType), dataArray is a memoryview valid until the reader is closed.
+        '''
+        if self._mmap is None :
+            self._mmap = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_COPY)
+
+        offset = self._offsets[index]
+        size, timestamp, frameType = _RECORD_HEADER.unpack_from(self._mmap, offset)
+
+        offset += _RECORD_HEADER.size
+        dataArray = memoryview(self._mmap)[offset : offset + size]
+
+        return (dataArray, timestamp, self._frameTypes[index])
+
+    def close(self) :
+        '''
+        close the file.
+        '''
+        if self._mmap is not None :
+            try:
+                self._mmap.close()
+            except BufferError :
+                pass ## views still in use, the mapping is released with them
+            self._mmap = None
+
+        self._file.close()
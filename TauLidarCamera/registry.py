@@ -0,0 +1,108 @@
+import json
+import os
+import threading
+
+from .info import CameraInfo
+
+DEFAULT_REGISTRY_PATH = os.path.join(os.path.expanduser('~'), '.taulidar', 'devices.json')
+
+class DeviceRegistry :
+    '''
+    Persistent registry of camera information, stored in a JSON file and keyed by serial port and uid.
+
+    Pass a registry to Camera.open(port, registry) to save the information of the camera, so the next
+    time the camera is opened on the same port its identity is verified with a single request instead
+    of reading all the information again.
+    '''
+
+    def __init__(self, path=DEFAULT_REGISTRY_PATH) :
+        '''
+        Parameters
+        ----------
+        path : str, optional
+            JSON file of the registry, ~/.taulidar/devices.json by default.
+        '''
+        self._path = path
+        self._lock = threading.Lock()
+        self._devices = {}
+
+        try:
+            with open(path, 'r') as f :
+                self._devices = json.load(f)
+        except (OSError, ValueError) :
+            pass
+
+    def lookup(self, port) :
+        '''
+        get the registered information of the camera on a serial port.
+
+        Returns
+        ----------
+        CameraInfo
+            The registered information, or None if there is no camera registered on the port.
+        '''
+        with self._lock :
+            device = self._devices.get(port)
+
+        if device is None :
+            return None
+
+        return CameraInfo(device['model'], device['firmware'], device['uid'], device['resolution'], port)
+
+    def find(self, uid) :
+        '''
+        get the registered information of a camera by uid.
+
+        Returns
+        ----------
+        CameraInfo
+            The registered information, or None if the camera is not registered.
+        '''
+        with self._lock :
+            ports = [port for port, device in self._devices.items() if device['uid'] == uid]
+
+        if len(ports) == 0 :
+            return None
+
+        return self.lookup(ports[0])
+
+    def update(self, info) :
+        '''
+        register the information of a camera and save the registry.
+
+        Parameters
+        ----------
+        info : CameraInfo
+            information of the camera, registered by its port.
+        '''
+        with self._lock :
+            ## a camera moved to another port is no longer on the old one
+            for port in [port for port, device in self._devices.items() if device['uid'] == info.uid] :
+                del self._devices[port]
+
+            self._devices[info.port] = {
+                'model':      info.model,
+                'firmware':   info.firmware,
+                'uid':        info.uid,
+                'resolution': info.resolution,
+            }
+            self._save()
+
+    def remove(self, port) :
+        '''
+        remove the camera registered on a serial port and save the registry.
+        '''
+        with self._lock :
+            if self._devices.pop(port, None) is not None :
+                self._save()
+
+    def _save(self) :
+        directory = os.path.dirname(self._path)
+        if directory and not os.path.exists(directory) :
+            os.makedirs(directory)
+
+        ## write a complete new file, so an interrupted save never leaves a broken registry
+        tmpPath = self._path + '.tmp'
+        with open(tmpPath, 'w') as f :
+            json.dump(self._devices, f, indent=2, sort_keys=True)
+        os.replace(tmpPath, self._path)
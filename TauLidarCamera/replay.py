@@ -0,0 +1,225 @@
+import time
+
+from TauLidarCommon.frame import FrameType
+
+from .constants import *
+from .camera import Camera
+from .frame import LazyFrame
+from .decoder import frameShape
+from .projector import rayTable
+from .recording import Reader
+
+class Replay :
+    '''
+    Replay a recording written by a Recorder with the read methods of a Camera, so code written for a
+    live camera runs on recorded sessions.
+
+        replay = Replay.open('session.tau', speed=1.0)
+
+        for frame in replay.stream():
+            ...
+
+        replay.close()
+
+    The recording is memory mapped, raw data read with pooled=True is a view of the mapping and no frame
+    is copied. Frames are returned at the recorded timing, scaled by the speed, or as fast as possible.
+
+    The read methods raise EOFError after the last frame, stream() ends there.
+    '''
+
+    def __init__(self, path, speed=1.0) :
+        '''
+        Parameters
+        ----------
+        path : str
+            file of the recording.
+        speed : float, optional
+            replay speed, 1.0 for the recorded timing, 2.0 for twice as fast, None for as fast as possible.
+        '''
+        self._reader = Reader(path)
+        self._speed = speed
+        self._position = 0
+        self._clock = None  ## (host time, recording time) the timing is relative to
+
+        ## frames were recorded with the ROI and HDR mode acknowledged by the camera, the full sensor if never set
+        self._roi = tuple(self._reader.settings.get('roi', (0, 0, TOF_635_IMAGE_WIDTH - 1, TOF_635_IMAGE_HEIGHT - 1)))
+        self._hdr = self._reader.settings.get('hdr', HDR_OFF)
+        self._width, self._height, rows = frameShape(self._roi, self._hdr)
+        self._rays = rayTable(*self._roi, rows)
+
+    @staticmethod
+    def open(path, speed=1.0) :
+        '''
+        open a recording, see Replay(path, speed).
+
+        Returns
+        ----------
+        Replay
+            An instance of Replay positioned on the first frame.
+        '''
+        return Replay(path, speed)
+
+    def close(self) :
+        '''
+        Close the recording.
+        '''
+        self._reader.close()
+
+    def info(self) :
+        '''
+        get the information of the recorded camera.
+
+        Returns
+        ----------
+        CameraInfo
+            CameraInfo of the recorded camera, None if not recorded.
+        '''
+        return self._reader.info
+
+    def roi(self) :
+        '''
+        get the ROI of the recorded frames, see Camera.roi().
+        '''
+        return self._roi
+
+    def hdr(self) :
+        '''
+        get the HDR mode of the recorded frames, see Camera.hdr().
+        '''
+        return self._hdr
+
+    @property
+    def settings(self) :
+        '''
+        dict of the parameters set on the camera when the recording started.
+        '''
+        return self._reader.settings
+
+    def __len__(self) :
+        return len(self._reader)
+
+    @property
+    def position(self) :
+        '''
+        index of the next frame read.
+        '''
+        return self._position
+
+    def setSpeed(self, speed) :
+        '''
+        Set replay speed, 1.0 for the recorded timing, None for as fast as possible.
+        '''
+        self._speed = speed
+        self._clock = None
+
+    def seek(self, index) :
+        '''
+        Move to a frame, the next read returns it right away and the timing restarts from it.
+
+        Parameters
+        ----------
+        index : int
+            index of the frame, negative indices count from the last frame.
+        '''
+        if index < 0 :
+            index += len(self._reader)
+
+        self._position = min(max(index, 0), len(self._reader))
+        self._clock = None
+
+    def seekTimestamp(self, timestamp) :
+        '''
+        Move to the first frame received at or after timestamp, see seek(index).
+        '''
+        self.seek(self._reader.find(timestamp))
+
+    def _next(self, frameType) :
+        reader = self._reader
+
+        while self._position < len(reader) :
+            index = self._position
+            self._position += 1
+
+            if frameType is None or reader._frameTypes[index] == frameType :
+                self._wait(reader.timestamp(index))
+                return reader.view(index)
+
+        raise EOFError("End of recording")
+
+    def _wait(self, timestamp) :
+        if self._speed is None :
+            return
+
+        now = time.monotonic()
+        if self._clock is None :
+            self._clock = (now, timestamp)
+            return
+
+        delay = self._clock[0] + (timestamp - self._clock[1]) / self._speed - now
+        if delay > 0 :
+            time.sleep(delay)
+
+    def readFrameRawData(self, frameType=None, pooled=False) :
+        '''
+        Read raw data of the next frame, see Camera.readFrameRawData(frameType, pooled).
+
+        Parameters
+        ----------
+        frameType : FrameType, optional
+            skip the recorded frames of other types, any type if not given.
+        pooled : bool
+            return a memoryview of the memory mapped recording instead of a copy, valid until the replay is closed.
+            The view is writable, changes are private and never written to the file.
+
+        Returns
+        ----------
+        bytearray
+            Raw data of the frame.
+
+        Raises
+        ----------
+        EOFError
+            There is no more frame.
+        '''
+        dataArray, timestamp, frameType = self._next(frameType)
+
+        return dataArray if pooled else bytearray(dataArray)
+
+    def readFrameRawDataAndTimestamp(self, frameType=None, pooled=False) :
+        '''
+        Read the next frame with its recorded timestamp and FrameType, see readFrameRawData(frameType, pooled).
+
+        Returns
+        ----------
+        tuple
+            (dataArray, timestamp, frameType).
+        '''
+        dataArray, timestamp, frameType = self._next(frameType)
+
+        return (dataArray if pooled else bytearray(dataArray), timestamp, frameType)
+
+    def readFrame(self, frameType=None) :
+        '''
+        Read the next Frame, see Camera.readFrame(frameType).
+
+        Returns
+        ----------
+        LazyFrame
+            An instance of LazyFrame, or None if a bad frame was recorded.
+        '''
+        dataArray, timestamp, frameType = self._next(frameType)
+
+        return LazyFrame.compose(dataArray, frameType, self._rays, Camera._colorizer, self._width, self._height)
+
+    def stream(self, frameType=None) :
+        '''
+        Iterate over the frames until the end of the recording, see Camera.stream(frameType). Bad frames are skipped.
+        '''
+        while True :
+            try:
+                frame = self.readFrame(frameType)
+            except EOFError :
+                return
+
+            if frame :
+                yield frame
@@ -0,0 +1,38 @@
+import os
+import timeit
+
+from TauLidarCamera.constants import *
+from TauLidarCamera import crc
+
+## header + payload covered by the checksum of each frame type, full 160x60 ROI
+frameSizes = [
+    ('DISTANCE',           COMMAND_SIZE_HEADER + TOF_635_IMAGE_HEADER_SIZE + 2 * 160 * 60),
+    ('DISTANCE_GRAYSCALE', COMMAND_SIZE_HEADER + TOF_635_IMAGE_HEADER_SIZE + 3 * 160 * 60),
+    ('DISTANCE_AMPLITUDE', COMMAND_SIZE_HEADER + TOF_635_IMAGE_HEADER_SIZE + 4 * 160 * 60),
+]
+
+def bitwise(data, size):
+    ## the original implementation, 32 shift steps per byte
+    value = crc.CRC_INIT_VALUE
+    for i in range(size):
+        value = crc._calcCrc32Uint32(value, data[i])
+    return value
+
+def run():
+    implementations = [('bitwise', bitwise, 1), ('zlib', crc._calcCrc32_32, 200)]
+
+    print('%-20s %8s' % ('frame type', 'bytes') + ''.join('%14s' % name for name, f, n in implementations))
+    for name, size in frameSizes:
+        data = bytearray(os.urandom(size))
+        expected = bitwise(data, size)
+
+        line = '%-20s %8d' % (name, size)
+        for implementation, f, number in implementations:
+            assert f(data, size) == expected
+            seconds = timeit.timeit(lambda: f(data, size), number=number) / number
+            line += '%11.3f ms' % (seconds * 1000)
+        print(line)
+
+
+if __name__ == "__main__":
+    run()
@@ -0,0 +1,79 @@
+import sys
+import time
+import timeit
+
+import numpy as np
+
+from TauLidarCommon.frame import FrameType
+from TauLidarCamera.constants import *
+from TauLidarCamera.camera import Camera, _FRAME_COMMANDS
+from TauLidarCamera.communication import Communication
+
+## full sensor, a band of 20 rows as used on a conveyor, and the center quarter
+rois = [
+    ('160x60 full',   (0, 0, 159, 59)),
+    ('160x20 band',   (0, 20, 159, 39)),
+    ('80x30 center',  (40, 15, 119, 44)),
+]
+
+frameTypes = [FrameType.DISTANCE, FrameType.DISTANCE_GRAYSCALE, FrameType.DISTANCE_AMPLITUDE]
+
+def transferSize(frameType, roi):
+    ## bytes on the serial link for one frame: reply header, image header, payload and checksum
+    comm = Communication()
+    comm._xMin, comm._yMin, comm._xMax, comm._yMax = roi
+    return COMMAND_SIZE_OVERHEAD + int(comm._getFrameDataSize(_FRAME_COMMANDS[frameType]))
+
+def processingTime(frameType, roi):
+    ## host time to decode, color and project one frame of the ROI
+    x0, y0, x1, y1 = roi
+    size = transferSize(frameType, roi) - COMMAND_SIZE_OVERHEAD - TOF_635_IMAGE_HEADER_SIZE
+    dataArray = bytearray(np.random.randint(0, 4000, size // 2, dtype=np.uint16).tobytes())
+
+    camera = Camera()
+    camera._comm._xMin, camera._comm._yMin, camera._comm._xMax, camera._comm._yMax = roi
+
+    image = np.empty((y1 - y0 + 1, x1 - x0 + 1, 3), dtype=np.uint8)
+    points = np.empty(((y1 - y0 + 1) * (x1 - x0 + 1), 3), dtype=np.float32)
+
+    def process():
+        decoded = Camera.decodeFrame(dataArray, frameType, roi)
+        Camera.colorize(decoded, out=image)
+        camera.projectPoints(decoded, out=points)
+
+    number = 200
+    return timeit.timeit(process, number=number) / number
+
+def frameRate(camera, frameType, roi, number=50):
+    camera.setRoi(*roi)
+    camera.readFrameRawData(frameType)
+
+    start = time.perf_counter()
+    for i in range(number):
+        camera.readFrameRawData(frameType, pooled=True)
+    return number / (time.perf_counter() - start)
+
+def run(port=None):
+    camera = Camera.open(port) if port else None
+
+    print('%-20s %-14s %8s %10s %12s' % ('frame type', 'roi', 'bytes', 'transfer', 'processing') + ('%10s' % 'fps' if camera else ''))
+    try:
+        for frameType in frameTypes:
+            full = transferSize(frameType, rois[0][1])
+
+            for name, roi in rois:
+                size = transferSize(frameType, roi)
+
+                line = '%-20s %-14s %8d %9.0f%% %9.3f ms' % (frameType.name, name, size, 100.0 * size / full, processingTime(frameType, roi) * 1000)
+                if camera:
+                    line += '%10.1f' % frameRate(camera, frameType, roi)
+                print(line)
+    finally:
+        if camera:
+            camera.setRoi(*rois[0][1])
+            camera.close()
+
+
+if __name__ == "__main__":
+    ## pass the serial port of a camera to also measure the frame rate
+    run(sys.argv[1] if len(sys.argv) > 1 else None)
@@ -40,12 +40,16 @@ def setup(serialPort=None):
 
 
 def run(camera):
+    mat_depth_rgb = None    ## reused for every frame of the same size
+
     while True:
-        frame = camera.readFrame(FrameType.DISTANCE)
+        frame = Camera.decodeFrame(camera.readFrameRawData(FrameType.DISTANCE), FrameType.DISTANCE, camera.roi(), camera.hdr())
 
         if frame:
-            mat_depth_rgb = np.frombuffer(frame.data_depth_rgb, dtype=np.uint16, count=-1, offset=0).reshape(frame.height, frame.width, 3)
-            mat_depth_rgb = mat_depth_rgb.astype(np.uint8)
+            if mat_depth_rgb is None or mat_depth_rgb.shape[:2] != (frame.height, frame.width):
+                mat_depth_rgb = np.empty((frame.height, frame.width, 3), dtype=np.uint8)
+
+            Camera.colorize(frame, out=mat_depth_rgb)   ## color the distance with a lookup table
 
             # Upscalling the image
             upscale = 4
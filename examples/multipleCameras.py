@@ -3,25 +3,19 @@ import cv2
 
 from TauLidarCommon.frame import FrameType
 from TauLidarCamera.camera import Camera
+from TauLidarCamera.group import CameraGroup
 
 def setup():
-    cameras = []
-
     Camera.setRange(0, 4500)                   ## points in the distance range to be colored
 
+    group = CameraGroup.open()                 ## Open all available Tau Cameras, each one on its own modulation channel
+
     uiOffset = 20
-    ports = Camera.scan()                 ## Scan for available Tau Camera devices
-    for port in ports:
-        camera = Camera.open(port)             ## Open the first available Tau Camera
-        camera.setModulationChannel(0)             ## autoChannelEnabled: 0, channel: 0
+    for camera in group.cameras:
         camera.setIntegrationTime3d(0, 1000)       ## set integration time 0: 1000
         camera.setMinimalAmplitude(0, 10)          ## set minimal amplitude 0: 80
 
-        cameras.append(camera)
-
-
-        cameraInfo = camera.info()
-
+    for cameraInfo in group.info():
         print("\nToF camera opened successfully:")
         print("    model:      %s" % cameraInfo.model)
         print("    firmware:   %s" % cameraInfo.firmware)
@@ -33,16 +27,18 @@ def setup():
         cv2.moveWindow('Tau %s'%cameraInfo.uid, 20, uiOffset)
         uiOffset += 340
 
-    if len(ports) > 0:
+    if len(group.cameras) > 0:
         print("\nPress Esc key over GUI or Ctrl-c in terminal to shutdown ...")
 
-    return cameras
+    return group
+
 
+def run(group):
+    group.start(FrameType.DISTANCE)            ## Read every camera on its own thread
 
-def run(cameras):
     while True:
-        for camera in cameras:
-            frame = camera.readFrame(FrameType.DISTANCE)
+        for cameraFrame in group.read():
+            frame = cameraFrame.compose()
 
             if frame:
                 mat_depth_rgb = np.frombuffer(frame.data_depth_rgb, dtype=np.uint16, count=-1, offset=0).reshape(frame.height, frame.width, 3)
@@ -52,25 +48,24 @@ def run(cameras):
                 upscale = 4
                 img =  cv2.resize(mat_depth_rgb, (frame.width*upscale, frame.height*upscale))
 
-                cv2.imshow('Tau %s'%camera.info().uid, img)
+                cv2.imshow('Tau %s'%cameraFrame.uid, img)
 
-                if cv2.waitKey(1) == 27: break
+        if cv2.waitKey(1) == 27: break
 
 
-def cleanup(cameras):
+def cleanup(group):
     print('\nShutting down ...')
     cv2.destroyAllWindows()
-    for camera in cameras:
-        camera.close()
+    group.close()
 
 
 if __name__ == "__main__":
-    cameras = setup()
+    group = setup()
 
-    if len(cameras) > 0:
+    if len(group.cameras) > 0:
         try:
-            run(cameras)
+            run(group)
         except Exception as e:
             print(e)
 
-        cleanup(cameras)
+        cleanup(group)
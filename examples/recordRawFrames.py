@@ -1,12 +1,12 @@
-import os
-import time
+import sys
 from signal import signal, SIGINT
 
 from TauLidarCommon.frame import FrameType
 from TauLidarCamera.camera import Camera
+from TauLidarCamera.recording import Recorder
 
 
-outputDir = './samples'
+outputPath = './samples.tau'
 runLoop = True
 
 def setup():
@@ -37,20 +37,22 @@ def run(camera):
     global runLoop
     count = 0
 
-    if not os.path.exists(outputDir):
-        os.makedirs(outputDir)
+    recorder = Recorder(outputPath, camera)    ## All frames go to a single file, written on a separate thread
 
     print('Recording...')
 
-    while runLoop:
-        frame = camera.readFrameRawData(FrameType.DISTANCE_AMPLITUDE)
+    try:
+        while runLoop:
+            frame = camera.readFrameRawData(FrameType.DISTANCE_AMPLITUDE)
 
-        if frame:
-            fName = '%s/%s.frame'%(outputDir, time.time())
-            with open(fName, "wb") as binary_file:
-                binary_file.write(frame)
-            print('\rFrame: %d'%count, end='')
-            count += 1
+            if frame:
+                recorder.write(frame, FrameType.DISTANCE_AMPLITUDE)
+                print('\rFrame: %d'%count, end='')
+                count += 1
+    finally:
+        recorder.close()                       ## Write the queued frames and the index of the frames
+
+    print('\n%d frames written, %d frames dropped' % (recorder.framesWritten, recorder.framesDropped))
 
 def cleanup(camera):
     print('\nShutting down ...')
@@ -62,6 +64,9 @@ def handler(signal_received, frame):
 
 
 if __name__ == "__main__":
+    if len(sys.argv) > 1:
+        outputPath = sys.argv[1]
+
     camera = setup()
     signal(SIGINT, handler)
 
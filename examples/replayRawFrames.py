@@ -6,7 +6,9 @@ import numpy as np
 import cv2
 
 from TauLidarCommon.frame import FrameType
+from TauLidarCamera.constants import HDR_OFF
 from TauLidarCamera.camera import Camera
+from TauLidarCamera.replay import Replay
 
 def setup():
     Camera.setRange(0, 2000)
@@ -20,7 +22,46 @@ def setup():
     cv2.moveWindow('Amplitude', 20, 360)
 
 
-def run(framesDir):
+def show(dataArray, frameType, roi=None, hdr=HDR_OFF):
+    frame = Camera.composeFrame(dataArray, frameType, roi, hdr)    ## frames recorded with a ROI or spatial HDR are smaller
+
+    if frame:
+        mat_depth_rgb = np.frombuffer(frame.data_depth_rgb, dtype=np.uint16, count=-1, offset=0).reshape(frame.height, frame.width, 3)
+        mat_depth_rgb = mat_depth_rgb.astype(np.uint8)
+
+        mat_amplitude = np.frombuffer(frame.data_amplitude, dtype=np.float32, count=-1, offset=0).reshape(frame.height, frame.width)
+        mat_amplitude = mat_amplitude.astype(np.uint8)
+
+        # Upscalling the image
+        upscale = 4
+        depth_img =  cv2.resize(mat_depth_rgb, (frame.width*upscale, frame.height*upscale))
+        amplitude_img =  cv2.resize(mat_amplitude, (frame.width*upscale, frame.height*upscale))
+
+        cv2.imshow('Depth Map', depth_img)
+        cv2.imshow('Amplitude', amplitude_img)
+
+    return cv2.waitKey(1) != 27
+
+
+def run(recordingPath):
+    replay = Replay.open(recordingPath, speed=1.0)    ## replay at the recorded frame rate, None for as fast as possible
+
+    print("%d frames recorded" % len(replay))
+
+    while True:
+        try:
+            dataArray, timestamp, frameType = replay.readFrameRawDataAndTimestamp(pooled=True)
+        except EOFError:
+            break
+
+        print(timestamp)
+
+        if not show(dataArray, frameType, replay.roi(), replay.hdr()): break
+
+    replay.close()
+
+
+def runFrameFiles(framesDir):
     delay = 0.1 #sec
 
     fileList = os.listdir(framesDir)
@@ -34,40 +75,23 @@ def run(framesDir):
         with open(os.path.join(framesDir, filename), 'rb') as f:
             dataArray = bytearray(f.read())
 
-            frame = Camera.composeFrame(dataArray, FrameType.DISTANCE_AMPLITUDE)
-
-            if frame:
-                mat_depth_rgb = np.frombuffer(frame.data_depth_rgb, dtype=np.uint16, count=-1, offset=0).reshape(frame.height, frame.width, 3)
-                mat_depth_rgb = mat_depth_rgb.astype(np.uint8)
-
-                mat_amplitude = np.frombuffer(frame.data_amplitude, dtype=np.float32, count=-1, offset=0).reshape(frame.height, frame.width)
-                mat_amplitude = mat_amplitude.astype(np.uint8)
-
-                # Upscalling the image
-                upscale = 4
-                depth_img =  cv2.resize(mat_depth_rgb, (frame.width*upscale, frame.height*upscale))
-                amplitude_img =  cv2.resize(mat_amplitude, (frame.width*upscale, frame.height*upscale))
-
-                cv2.imshow('Depth Map', depth_img)
-                cv2.imshow('Amplitude', amplitude_img)
-
-                if cv2.waitKey(1) == 27: break
+            if not show(dataArray, FrameType.DISTANCE_AMPLITUDE): break
         time.sleep(delay)
 
 
-
-
-
 if __name__ == "__main__":
-    framesDir = 'samples'
+    recordingPath = 'samples.tau'
     if len(sys.argv) > 1:
-        framesDir = sys.argv[1]
+        recordingPath = sys.argv[1]
 
     setup()
 
-    if os.path.exists(framesDir):
+    if os.path.exists(recordingPath):
         try:
             print("\nPress Esc key over GUI or Ctrl-c in terminal to shutdown ...")
-            run(framesDir)
+            if os.path.isdir(recordingPath):
+                runFrameFiles(recordingPath)   ## a directory of .frame files recorded by earlier versions
+            else:
+                run(recordingPath)
         except Exception as e:
             print(e)
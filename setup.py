@@ -22,7 +22,8 @@ setuptools.setup(
     packages=setuptools.find_packages(),
     install_requires=[
         'TauLidarCommon',
-        'pyserial'
+        'pyserial',
+        'numpy'
     ],
     license=about['__license__'],
     classifiers=[